@@ -1,79 +1,58 @@
 # app/__init__.py
-import jwt
-import cloudinary
-from flask import request, g
+import click
 from app.config import Config
 from flask import Flask
-from app.extensions import db, migrate, cors
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app.extensions import db, cors, post_cache, media, infinity
 from app.routes import register_routes  # <- usar el init de routes
-import os
-import requests
-
-cloudinary.config(
-    cloud_name=Config.CLOUDINARY_CLOUD_NAME,
-    api_key=Config.CLOUDINARY_API_KEY,
-    api_secret=Config.CLOUDINARY_API_SECRET
-)
-
-# 🔹 Clase para loguear cambios en g.current_user
-class LoggedDict(dict):
-    def __setitem__(self, key, value):
-        if key == "membership_level" and self.get(key) != value:
-            import traceback
-            print(f"🛑 g.current_user['membership_level'] cambiado: {self.get(key)} -> {value}")
-            traceback.print_stack()
-        super().__setitem__(key, value)
-
-# app/__init__.py o donde cargas el user desde el token
-def load_user():
-    auth_header = request.headers.get("Authorization", "")
-    g.current_user = None
-
-    if auth_header and auth_header.startswith("Bearer "):
-        token = auth_header.replace("Bearer ", "")
-        try:
-            payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-
-            membership_level = str(payload.get("membership_level", "platinum")).replace(" ", "").strip().lower()
-
-            g.current_user = LoggedDict({
-                "id": payload.get("sub"),
-                "username": payload.get("username"),
-                "role": payload.get("role"),
-                "membership_level": membership_level,
-                "is_admin": payload.get("is_admin", False),
-                "is_buyer": payload.get("is_buyer", False),
-                "is_seller": payload.get("is_seller", False),
-            })
-
-            # 🔹 Log justo después de decodificar el token
-            print("🔹 JWT payload crudo:", payload)
-            print("🔹 g.current_user inicial:", g.current_user)
-
-        except jwt.ExpiredSignatureError:
-            print("⚠️ Token expirado")
-        except jwt.InvalidTokenError as e:
-            print("❌ Token inválido:", e)
-    else:
-        print("⚠️ No se recibió Authorization válido")
-
+from app.commands import register_commands
+from app.auth.tokens import load_user
+from app.utils.sql import enable_sqlite_foreign_keys
+from app.utils.log import configure_logging
+from app.utils.metrics import init_metrics
+from app.utils.db_routing import init_db_routing
+from app.utils.search import register_search_listeners
+from app.utils.facets import register_facet_listeners
+from app.utils.payloads import register_payload_listeners
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    hops = app.config["PROXY_HOPS"]
+    if hops:
+        # Esquema e IP del cliente según el proxy (request.is_secure detrás de TLS)
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    configure_logging(app)
 
     # Inicializar extensiones
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        for engine in db.engines.values():
+            enable_sqlite_foreign_keys(engine)
+        # Primero que el resto de los hooks: el tiempo incluye load_user()
+        init_metrics(app, *db.engines.values())
+    init_db_routing(app, db)
+    # Flask-Migrate (y alembic) solo hace falta en la CLI (`flask db ...`);
+    # el servidor no lo importa
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
     cors.init_app(
         app,
         resources={r"/*": {"origins": "*"}},
         supports_credentials=True,
         allow_headers=["Content-Type", "Authorization"]
     )
+    post_cache.init_app(app)
+    media.init_app(app)
+    infinity.init_app(app)
+    register_search_listeners()
+    register_facet_listeners()
+    register_payload_listeners()
 
     # Registrar blueprints centralizado
     register_routes(app)
+    register_commands(app)
 
     @app.before_request
     def before_request():
@@ -1,55 +1,19 @@
 # app/auth/decorators.py
 from functools import wraps
-from flask import request, jsonify, g
-import jwt, os
+from flask import jsonify, g
 
-SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "supersecret")
-
-class LoggedDict(dict):
-    def __setitem__(self, key, value):
-        if self.get(key) != value:
-            import traceback
-            print(f"🛑 g.current_user['{key}'] cambiado: {self.get(key)} -> {value}")
-            traceback.print_stack()
-        super().__setitem__(key, value)
 
 def jwt_required_local(f):
+    """Exige un token válido; la verificación ya la hizo load_user() en before_request"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            print("⚠️ No se recibió Authorization válido")
-            return jsonify({"error": "Token requerido"}), 401
-
-        token = auth_header.split(" ")[1]
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            
-            membership_level = str(payload.get("membership_level", "platinum")).replace(" ", "").lower()
-            
-            g.current_user = LoggedDict({
-                "id": payload.get("sub"),
-                "username": payload.get("username"),
-                "role": payload.get("role"),
-                "membership_level": membership_level,
-                "is_admin": payload.get("is_admin", False),
-                "is_buyer": payload.get("is_buyer", False),
-                "is_seller": payload.get("is_seller", False),
-            })
-
-            print("🔹 g.current_user inicial:", g.current_user)
-
-        except jwt.ExpiredSignatureError:
-            return jsonify({"error": "Token expirado"}), 401
-        except jwt.InvalidTokenError as e:
-            return jsonify({"error": f"Token inválido: {str(e)}"}), 401
-
+        if getattr(g, "current_user", None) is None:
+            error = getattr(g, "auth_error", None) or "Token requerido"
+            return jsonify({"error": error}), 401
         return f(*args, **kwargs)
     return decorated
 
 
-
-
 def membership_required(levels_allowed):
     def decorator(f):
         @wraps(f)
@@ -82,4 +46,16 @@ def login_required(f):
         if not getattr(g, "current_user", None):
             return jsonify({"error": "No logueado"}), 401
         return f(*args, **kwargs)
-    return decorated
\ No newline at end of file
+    return decorated
+
+
+def admin_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        user = getattr(g, "current_user", None)
+        if not user:
+            return jsonify({"error": "No logueado"}), 401
+        if not (user.get("is_admin") or user.get("role") == "admin"):
+            return jsonify({"error": "No autorizado"}), 403
+        return f(*args, **kwargs)
+    return decorated
@@ -0,0 +1,119 @@
+# app/auth/refresh_tokens.py
+"""
+Refresh tokens: renuevan el access token localmente, sin volver a Infinity.
+
+El login con contraseña valida la membresía contra Infinity y emite un
+refresh token opaco (solo se persiste su sha256). /auth/refresh lo rota:
+revoca el usado, emite otro de la misma familia y un access token nuevo
+con los claims guardados. Reusar un token ya rotado revoca la familia
+entera (probable robo). Pasado MEMBERSHIP_REVALIDATE_HOURS desde el
+último login hay que volver a loguearse para revalidar la membresía.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.refreshToken import RefreshToken
+
+
+class RefreshTokenError(Exception):
+    def __init__(self, message, reauth=False):
+        super().__init__(message)
+        self.reauth = reauth
+
+
+def hash_refresh_token(raw):
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def issue_refresh_token(user, membership_level, is_admin=False, is_buyer=False, is_seller=False,
+                        family_id=None, validated_at=None):
+    """Crea un refresh token (sin commit) y devuelve (token_en_claro, registro)"""
+    now = datetime.utcnow()
+    raw = secrets.token_urlsafe(48)
+    record = RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(raw),
+        family_id=family_id or secrets.token_hex(16),
+        membership_level=membership_level,
+        is_admin=is_admin,
+        is_buyer=is_buyer,
+        is_seller=is_seller,
+        membership_validated_at=validated_at or now,
+        expires_at=now + timedelta(days=current_app.config["REFRESH_TOKEN_DAYS"]),
+    )
+    db.session.add(record)
+    return raw, record
+
+
+def revoke_family(family_id, now=None):
+    now = now or datetime.utcnow()
+    RefreshToken.query.filter(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None),
+    ).update({"revoked_at": now}, synchronize_session=False)
+
+
+def rotate_refresh_token(raw):
+    """
+    Valida y rota el token. Devuelve (nuevo_token_en_claro, nuevo_registro).
+    Lanza RefreshTokenError si no se puede renovar. No hace commit salvo
+    al revocar una familia por reuso.
+    """
+    now = datetime.utcnow()
+    record = (
+        RefreshToken.query
+        .filter_by(token_hash=hash_refresh_token(raw or ""))
+        .with_for_update()
+        .first()
+    )
+    if record is None:
+        raise RefreshTokenError("Refresh token inválido")
+
+    if record.revoked_at is not None:
+        if record.replaced_by_id is not None:
+            revoke_family(record.family_id, now)
+            db.session.commit()
+            raise RefreshTokenError("Refresh token reutilizado; la sesión fue revocada", reauth=True)
+        raise RefreshTokenError("Refresh token revocado", reauth=True)
+
+    if record.expires_at <= now:
+        raise RefreshTokenError("Refresh token expirado", reauth=True)
+
+    revalidate_after = timedelta(hours=current_app.config["MEMBERSHIP_REVALIDATE_HOURS"])
+    if record.membership_validated_at + revalidate_after <= now:
+        raise RefreshTokenError("Es necesario volver a iniciar sesión para validar la membresía", reauth=True)
+
+    new_raw, new_record = issue_refresh_token(
+        record.user,
+        record.membership_level,
+        is_admin=record.is_admin,
+        is_buyer=record.is_buyer,
+        is_seller=record.is_seller,
+        family_id=record.family_id,
+        validated_at=record.membership_validated_at,
+    )
+    record.revoked_at = now
+    record.replaced_by = new_record
+    return new_raw, new_record
+
+
+def revoke_refresh_token(raw):
+    """Logout: revoca la familia del token. Devuelve False si no existe"""
+    record = RefreshToken.query.filter_by(token_hash=hash_refresh_token(raw or "")).first()
+    if record is None:
+        return False
+    revoke_family(record.family_id)
+    return True
+
+
+def prune_refresh_tokens(now=None):
+    """
+    Borra los tokens vencidos; devuelve cuántos. Los revocados se conservan
+    hasta vencer para seguir detectando reusos.
+    """
+    now = now or datetime.utcnow()
+    return RefreshToken.query.filter(RefreshToken.expires_at <= now).delete(synchronize_session=False)
@@ -0,0 +1,144 @@
+# app/auth/tokens.py
+"""
+Verificación de JWT: un único camino por request.
+
+load_user() corre en before_request, verifica el token una sola vez y deja
+en g.current_user un CurrentUser (o None + g.auth_error). Los decoradores
+solo leen g. Los tokens ya verificados se guardan en una caché acotada,
+indexada por el sha256 del token y que expira junto con el token, así las
+requests repetidas de una misma sesión se saltan el HMAC y la
+normalización de claims.
+"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, g, request
+
+from app.config import Config
+from app.utils.cache import LRUCache
+from app.utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+verified_tokens = LRUCache(maxsize=Config.TOKEN_CACHE_MAXSIZE, ttl=Config.TOKEN_CACHE_TTL)
+
+
+class CurrentUser:
+    """
+    Usuario autenticado del request. Es compartido entre requests vía la
+    caché de tokens, así que se trata como inmutable. Acepta acceso tipo
+    dict (user["id"], user.get(...)) para las reglas de membresía.
+    """
+    __slots__ = ("id", "username", "role", "membership_level",
+                 "is_admin", "is_buyer", "is_seller", "expires_at")
+
+    FIELDS = ("id", "username", "role", "membership_level", "is_admin", "is_buyer", "is_seller")
+
+    def __init__(self, id, username, role, membership_level,
+                 is_admin=False, is_buyer=False, is_seller=False, expires_at=None):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.membership_level = membership_level
+        self.is_admin = is_admin
+        self.is_buyer = is_buyer
+        self.is_seller = is_seller
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_claims(cls, payload):
+        return cls(
+            id=payload.get("sub"),
+            username=payload.get("username"),
+            role=payload.get("role"),
+            membership_level=str(payload.get("membership_level", "platinum")).replace(" ", "").strip().lower(),
+            is_admin=payload.get("is_admin", False),
+            is_buyer=payload.get("is_buyer", False),
+            is_seller=payload.get("is_seller", False),
+            expires_at=payload.get("exp"),
+        )
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __repr__(self):
+        return f"<CurrentUser {self.id} {self.membership_level}>"
+
+
+def issue_access_token(user, membership_level, is_admin=False, is_buyer=False, is_seller=False):
+    """Firma un access token de vida corta; devuelve (token, segundos_de_vida)"""
+    import jwt  # diferido: PyJWT no se importa hasta el primer token
+
+    expires_in = int(current_app.config["ACCESS_TOKEN_MINUTES"]) * 60
+    payload = {
+        "sub": str(user.id),
+        "username": user.username,
+        "role": user.role,
+        "membership_level": membership_level,
+        "is_admin": is_admin,
+        "is_buyer": is_buyer,
+        "is_seller": is_seller,
+        "exp": datetime.utcnow() + timedelta(seconds=expires_in)
+    }
+    return jwt.encode(payload, current_app.config["JWT_SECRET_KEY"], algorithm="HS256"), expires_in
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def verify_token(token):
+    """
+    Devuelve el CurrentUser del token. Lanza jwt.ExpiredSignatureError /
+    jwt.InvalidTokenError igual que jwt.decode.
+    """
+    key = token_digest(token)
+    user = verified_tokens.get(key)
+    now = time.time()
+    if user is not None and (user.expires_at is None or user.expires_at > now):
+        return user
+
+    import jwt
+
+    payload = jwt.decode(token, current_app.config["JWT_SECRET_KEY"], algorithms=["HS256"])
+    user = CurrentUser.from_claims(payload)
+
+    # ⏳ Nunca cachear más allá de la expiración del propio token
+    ttl = verified_tokens.ttl
+    if user.expires_at is not None:
+        ttl = min(ttl, user.expires_at - now)
+    if ttl > 0:
+        verified_tokens.set(key, user, ttl=ttl)
+    return user
+
+
+def load_user():
+    """Verifica el bearer token del request (una sola vez) y llena g.current_user"""
+    g.current_user = None
+    g.auth_error = None
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return
+
+    import jwt
+
+    token = auth_header[len("Bearer "):].strip()
+    try:
+        g.current_user = verify_token(token)
+    except jwt.ExpiredSignatureError:
+        g.auth_error = "Token expirado"
+        log_event(logger, "auth.token_expired", level=logging.DEBUG, sampled=True)
+    except jwt.InvalidTokenError as e:
+        g.auth_error = f"Token inválido: {str(e)}"
+        log_event(logger, "auth.token_invalid", level=logging.WARNING, reason=str(e))
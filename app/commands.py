@@ -0,0 +1,183 @@
+# app/commands.py
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask):
+    """
+    Registrar los comandos de `flask ...` de la aplicación.
+    Llamá a register_commands(app) desde app.create_app().
+    """
+
+    @app.cli.command("outbox-worker")
+    @click.option("--once", is_flag=True, help="Procesar un solo lote y salir.")
+    @click.option("--batch-size", default=100, show_default=True)
+    @click.option("--interval", default=5.0, show_default=True, help="Segundos de espera con la cola vacía.")
+    def outbox_worker(once, batch_size, interval):
+        """Vacía el outbox de borrados de imágenes en Cloudinary."""
+        from app.extensions import media
+        from app.utils.outbox import drain_asset_outbox, run_outbox_worker
+
+        if once:
+            done, failed = drain_asset_outbox(media.client, batch_size=batch_size)
+            click.echo(f"borrados: {done}, fallidos: {failed}")
+            return
+        run_outbox_worker(media.client, interval=interval, batch_size=batch_size)
+
+    @app.cli.command("sweep-assets")
+    @click.option("--older-than-hours", default=24, show_default=True,
+                  help="Antigüedad mínima de una imagen sin posts para borrarla.")
+    def sweep_assets_command(older_than_hours):
+        """Agenda el borrado de las imágenes subidas que ningún post usa."""
+        from datetime import timedelta
+        from app.extensions import db
+        from app.utils.media_assets import sweep_unused_assets
+
+        queued = sweep_unused_assets(timedelta(hours=older_than_hours))
+        db.session.commit()
+        click.echo(f"imágenes agendadas para borrar: {queued}")
+
+    @app.cli.command("prune-refresh-tokens")
+    def prune_refresh_tokens_command():
+        """Borra los refresh tokens vencidos."""
+        from app.extensions import db
+        from app.auth.refresh_tokens import prune_refresh_tokens
+
+        deleted = prune_refresh_tokens()
+        db.session.commit()
+        click.echo(f"refresh tokens borrados: {deleted}")
+
+
+    @app.cli.command("rebuild-facets")
+    def rebuild_facets_command():
+        """Recalcula category_key y los conteos de /posts/facets desde la tabla posts."""
+        from app.extensions import db
+        from app.models.post import Post
+        from app.utils.facets import backfill_category_keys, rebuild_facet_counts
+
+        keys = backfill_category_keys(db.session.connection(bind_arguments={"mapper": Post}))
+        rows = rebuild_facet_counts()
+        db.session.commit()
+        click.echo(f"claves de categoría corregidas: {keys}, facetas recalculadas: {rows}")
+
+
+    @app.cli.command("reindex-search")
+    @click.option("--batch-size", default=500, show_default=True)
+    def reindex_search_command(batch_size):
+        """Reindexa la búsqueda de texto completo de todos los posts."""
+        from app.extensions import db
+        from app.models.post import Post
+        from app.utils.search import backfill_search_index, get_search_backend
+
+        connection = db.session.connection(bind_arguments={"mapper": Post})
+        backend = get_search_backend(connection.dialect.name)
+        backend.prepare(connection)
+        total = backfill_search_index(connection, batch_size=batch_size, backend=backend)
+        db.session.commit()
+        click.echo(f"posts indexados: {total}")
+
+
+    @app.cli.command("export-posts")
+    @click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-", show_default=True)
+    @click.option("--user-id", type=int)
+    @click.option("--company-id", type=int)
+    @click.option("--category")
+    @click.option("--since", type=click.DateTime(), help="Solo posts creados desde esta fecha.")
+    @click.option("--until", type=click.DateTime(), help="Solo posts creados antes de esta fecha.")
+    def export_posts_command(output, user_id, company_id, category, since, until):
+        """Exporta posts en NDJSON (un post por línea)."""
+        from app.utils.transfer import iter_export_lines
+
+        for line in iter_export_lines(user_id=user_id, company_id=company_id, category=category,
+                                      since=since, until=until):
+            output.write(line)
+
+    @app.cli.command("import-posts")
+    @click.argument("source", type=click.File("r", encoding="utf-8"))
+    @click.option("--batch-size", default=500, show_default=True)
+    def import_posts_command(source, batch_size):
+        """Importa posts desde un archivo NDJSON (- para stdin)."""
+        from app.utils.transfer import import_lines
+
+        result = import_lines(source, batch_size=batch_size)
+        for error in result["errors"]:
+            click.echo(f"línea {error['line']}: {error['error']}", err=True)
+        click.echo(f"importados: {result['imported']}, con error: {len(result['errors'])}")
+
+
+    @app.cli.command("rebuild-posts")
+    @click.option("--batch-size", default=500, show_default=True)
+    def rebuild_posts_command(batch_size):
+        """Recalcula métricas, payloads JSON y conteos de imágenes de todos los posts."""
+        from sqlalchemy import select
+        from sqlalchemy.orm import joinedload
+        from app.extensions import db
+        from app.models.post import Post
+        from app.utils.payloads import write_payloads
+
+        last_id, total = 0, 0
+        while True:
+            posts = db.session.scalars(
+                select(Post).options(joinedload(Post.body))
+                .where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+            ).all()
+            if not posts:
+                break
+            for post in posts:
+                post.set_content(post.content_blocks)
+            db.session.flush()
+            write_payloads(db.session.connection(), posts)
+            last_id = posts[-1].id
+            total += len(posts)
+            db.session.commit()
+            db.session.expunge_all()
+
+        # Las imágenes de los bloques (image_refs) también cuentan como uso
+        from app.utils.media_assets import recount_asset_refs
+        assets = recount_asset_refs()
+        db.session.commit()
+        click.echo(f"posts recalculados: {total}, conteos de imágenes corregidos: {assets}")
+
+
+    @app.cli.command("export-static")
+    @click.argument("out_dir", type=click.Path(file_okay=False))
+    @click.option("--per-page", default=12, show_default=True, help="Posts por página del índice.")
+    @click.option("--full", is_flag=True, help="Ignorar el manifest y reescribir todo.")
+    def export_static_command(out_dir, per_page, full):
+        """Escribe el detalle y el índice de los posts como JSON estático."""
+        from app.utils.static_export import export_static
+
+        result = export_static(out_dir, per_page=per_page, full=full)
+        click.echo(
+            f"posts escritos: {result['posts_written']}, borrados: {result['posts_removed']}, "
+            f"páginas del índice: {result['index_pages_written']}"
+        )
+
+
+    @app.cli.command("profile-startup")
+    @click.option("--path", default="/posts/", show_default=True, help="Ruta del primer request.")
+    @click.option("--runs", default=3, show_default=True, help="Corridas (se informa la mediana).")
+    @click.option("--top", default=20, show_default=True, help="Cantidad de módulos a listar.")
+    @click.option("--sort", type=click.Choice(["cumulative", "self"]), default="cumulative", show_default=True)
+    @click.option("--package", default=None, help="Solo módulos con este prefijo (p. ej. app.).")
+    @click.option("--json", "as_json", is_flag=True, help="Salida en JSON.")
+    def profile_startup_command(path, runs, top, sort, package, as_json):
+        """Mide el arranque en frío: import por módulo y tiempo hasta el primer request."""
+        import json
+        from app.utils.startup import profile_startup, top_modules
+
+        result = profile_startup(path=path, runs=runs)
+        modules = top_modules(result["modules"], count=top, key=f"{sort}_us", package_prefix=package)
+        if as_json:
+            click.echo(json.dumps({"timings": result["timings"], "runs": result["runs"], "modules": modules}, indent=2))
+            return
+
+        t = result["timings"]
+        click.echo(f"arranque (mediana de {runs} corridas):")
+        click.echo(f"  intérprete          {t['interpreter'] * 1000:8.1f} ms")
+        click.echo(f"  imports + create_app{t['app'] * 1000:8.1f} ms")
+        click.echo(f"  primer request      {t['first_request'] * 1000:8.1f} ms  (GET {path} -> {t['status']})")
+        click.echo(f"  total               {t['total'] * 1000:8.1f} ms")
+        click.echo(f"módulos más lentos ({'acumulado' if sort == 'cumulative' else 'propio'}):")
+        for m in modules:
+            click.echo(f"  {m[sort + '_us'] / 1000:8.1f} ms  {m['module']}")
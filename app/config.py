@@ -1,14 +1,115 @@
 # app/config.py
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# .env solo en desarrollo: si no existe (producción) ni se importa python-dotenv
+_ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+if os.path.exists(_ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
+
+
+def engine_options(url, pool_size, max_overflow):
+    """Opciones de create_engine para `url` (pool y statement_timeout desde el entorno)"""
+    if not url:
+        return {}
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() != "false",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    }
+    if url.startswith("sqlite"):
+        # SQLite (local) usa el pool que elige Flask-SQLAlchemy
+        return options
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 10)),
+    )
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    if statement_timeout and url.startswith("postgres"):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool por proceso: pool_size + max_overflow conexiones como máximo por worker
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, DB_POOL_SIZE, DB_MAX_OVERFLOW)
+    # Réplica de lectura opcional (ver app/utils/db_routing.py)
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    SQLALCHEMY_BINDS = {
+        "replica": {
+            "url": DATABASE_REPLICA_URL,
+            **engine_options(
+                DATABASE_REPLICA_URL,
+                int(os.getenv("DB_REPLICA_POOL_SIZE", DB_POOL_SIZE)),
+                int(os.getenv("DB_REPLICA_MAX_OVERFLOW", DB_MAX_OVERFLOW)),
+            ),
+        }
+    } if DATABASE_REPLICA_URL else {}
+    # Proxies delante de la app que agregan X-Forwarded-* (Render: 1; 0 = ninguno)
+    PROXY_HOPS = int(os.getenv("PROXY_HOPS", 1))
+    # Segundos que un cliente que escribió sigue leyendo del primario
+    DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", 5))
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # Access tokens cortos + refresh tokens rotativos
+    ACCESS_TOKEN_MINUTES = int(os.getenv("ACCESS_TOKEN_MINUTES", 15))
+    REFRESH_TOKEN_DAYS = int(os.getenv("REFRESH_TOKEN_DAYS", 30))
+    MEMBERSHIP_REVALIDATE_HOURS = int(os.getenv("MEMBERSHIP_REVALIDATE_HOURS", 24 * 7))
+    # Caché de tokens ya verificados (por proceso)
+    TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", 4096))
+    TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 300))
     CLOUDINARY_CLOUD_NAME = os.environ.get("CLOUDINARY_CLOUD_NAME")
     CLOUDINARY_API_KEY = os.environ.get("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET = os.environ.get("CLOUDINARY_API_SECRET")
+
+    # Login upstream de Infinity (timeouts en segundos)
+    INFINITY_LOGIN_URL = os.getenv("INFINITY_LOGIN_URL", "https://infinity-gainers.onrender.com/users/login")
+    INFINITY_CONNECT_TIMEOUT = float(os.getenv("INFINITY_CONNECT_TIMEOUT", 2))
+    INFINITY_READ_TIMEOUT = float(os.getenv("INFINITY_READ_TIMEOUT", 5))
+    INFINITY_POOL_SIZE = int(os.getenv("INFINITY_POOL_SIZE", 10))
+    INFINITY_MAX_RETRIES = int(os.getenv("INFINITY_MAX_RETRIES", 2))
+    # Plazo total de un login, reintentos incluidos
+    INFINITY_LOGIN_DEADLINE = float(os.getenv("INFINITY_LOGIN_DEADLINE", 6))
+    INFINITY_BREAKER_THRESHOLD = int(os.getenv("INFINITY_BREAKER_THRESHOLD", 5))
+    INFINITY_BREAKER_RESET = float(os.getenv("INFINITY_BREAKER_RESET", 30))
+
+    # Logging estructurado (ver app/utils/log.py)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 0.01))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+    # Subida de imágenes en lote
+    UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", 4))
+    UPLOAD_MAX_BATCH_FILES = int(os.getenv("UPLOAD_MAX_BATCH_FILES", 10))
+
+    # Creación de posts en lote (POST /posts/bulk)
+    POST_BULK_MAX_ITEMS = int(os.getenv("POST_BULK_MAX_ITEMS", 50))
+
+    # Caché del detalle de posts ("memory" o "redis"; redis si hay POST_CACHE_URL)
+    POST_CACHE_URL = os.getenv("POST_CACHE_URL")
+    POST_CACHE_BACKEND = os.getenv("POST_CACHE_BACKEND", "redis" if POST_CACHE_URL else "memory")
+    POST_CACHE_TTL = int(os.getenv("POST_CACHE_TTL", 300))
+    # TTL del caché en memoria con varios workers (la invalidación es por proceso)
+    POST_CACHE_LOCAL_TTL = int(os.getenv("POST_CACHE_LOCAL_TTL", 5))
+    # Cantidad de workers del servidor (gunicorn.conf.py la completa)
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+    POST_CACHE_MAXSIZE = int(os.getenv("POST_CACHE_MAXSIZE", 1024))
+
+    # Búsqueda de texto completo (configuración de to_tsvector en Postgres)
+    SEARCH_TEXT_CONFIG = os.getenv("SEARCH_TEXT_CONFIG", "spanish")
+
+    # Segundos que se cachea (por proceso) la respuesta de /posts/facets
+    FACETS_CACHE_TTL = int(os.getenv("FACETS_CACHE_TTL", 30))
+
+    # Métricas Prometheus en GET /metrics: se exige METRICS_TOKEN como Bearer.
+    # Sin token el endpoint responde 404, salvo METRICS_PUBLIC=true (solo local)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() != "false"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+    # Requests con más sentencias SQL que esto se loguean como request.many_queries
+    METRICS_SQL_WARN_THRESHOLD = int(os.getenv("METRICS_SQL_WARN_THRESHOLD", 25))
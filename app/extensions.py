@@ -1,7 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
+from app.utils.cache import PostCache
+from app.utils.media import MediaStorage
+from app.utils.infinity import InfinityClient
+from app.utils.db_routing import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 cors = CORS()
+post_cache = PostCache()
+media = MediaStorage()
+infinity = InfinityClient()
@@ -4,6 +4,13 @@ Paquete de modelos de la aplicación.
 Importa aquí los modelos para que puedan ser referenciados como:
 from app.models import Post
 """
-from .post import Post
+from .post import Post, PostBody
+from .slugReservation import SlugReservation
+from .weeklyPostQuota import WeeklyPostQuota
+from .mediaAsset import MediaAsset
+from .assetDeletion import AssetDeletion
+from .blogUser import BlogUser
+from .refreshToken import RefreshToken
+from .postFacetCount import PostFacetCount
 
-__all__ = ["Post","BlogUser"]
+__all__ = ["Post","PostBody","SlugReservation","WeeklyPostQuota","MediaAsset","AssetDeletion","BlogUser","RefreshToken","PostFacetCount"]
@@ -0,0 +1,20 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class AssetDeletion(db.Model):
+    """Outbox de imágenes a borrar en Cloudinary; se escribe en la misma transacción que el cambio"""
+    __tablename__ = "asset_deletions"
+    __table_args__ = (
+        db.Index("ix_asset_deletions_next_attempt_at", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AssetDeletion {self.public_id} attempts={self.attempts}>"
@@ -0,0 +1,23 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class MediaAsset(db.Model):
+    """Imagen subida a Cloudinary, identificada por el sha256 de su contenido"""
+    __tablename__ = "media_assets"
+
+    id = db.Column(db.Integer, primary_key=True)
+    digest = db.Column(db.String(64), nullable=False, unique=True)
+    url = db.Column(db.String, nullable=False)
+    public_id = db.Column(db.String, nullable=False, unique=True)
+
+    # Cantidad de posts que usan la imagen; al llegar a 0 se puede destruir
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {"url": self.url, "public_id": self.public_id}
+
+    def __repr__(self):
+        return f"<MediaAsset {self.public_id} refs={self.ref_count}>"
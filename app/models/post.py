@@ -1,11 +1,28 @@
 from datetime import datetime
 from app.extensions import db
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, JSONB, TSVECTOR
+from sqlalchemy.orm import joinedload, load_only, validates
+from app.utils.content import analyze_blocks
+
+
+def normalize_category(category):
+    """Clave de filtrado de la categoría: sin espacios sobrantes y en minúsculas"""
+    category = (category or "").strip()
+    return category.casefold() if category else None
 
 
 # app/models/post.py
 class Post(db.Model):
     __tablename__ = "posts"
+    __table_args__ = (
+        # 🔁 Índices para la paginación por cursor (created_at, id)
+        db.Index("ix_posts_created_at_id", "created_at", "id"),
+        db.Index("ix_posts_company_id_created_at_id", "company_id", "created_at", "id"),
+        db.Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+        db.Index("ix_posts_category_key_created_at_id", "category_key", "created_at", "id"),
+        # 🔎 Búsqueda de texto completo (solo Postgres; ver app/utils/search.py)
+        db.Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     
@@ -14,19 +31,33 @@ class Post(db.Model):
     description = db.Column(db.String(500), nullable=False)
     keywords = db.Column(db.String(255), nullable=True)
     category = db.Column(db.String(100), nullable=True)
+    # Se completa solo desde `category` (ver normalize_category). active_history
+    # conserva el valor anterior para ajustar los conteos de facetas
+    category_key = db.column_property(db.Column(db.String(100), nullable=True), active_history=True)
 
-    # 🧱 Bloques de contenido dinámico
-    content_blocks = db.Column(JSON, nullable=False, default=[])
+    # 🧱 Bloques de contenido dinámico: viven en post_bodies y solo se cargan
+    # cuando se accede a content_blocks (ver PostBody)
+    body = db.relationship(
+        "PostBody",
+        uselist=False,
+        lazy="select",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     # 🖼️ Imagen destacada
     featured_image = db.Column(db.String, nullable=True)
     featured_image_public_id = db.Column(db.String, nullable=True)
 
     # 🏢 Relación con compañía (viene desde Infinity)
-    company_id = db.Column(db.Integer, nullable=True)
+    company_id = db.column_property(db.Column(db.Integer, nullable=True), active_history=True)
 
     #limite de palabras y limite por semana
     word_count = db.Column(db.Integer, default=0)
+    # 📐 Derivados de content_blocks al escribir (ver set_content)
+    reading_time = db.Column(db.Integer, nullable=False, default=0)
+    excerpt = db.Column(db.String(300), nullable=True)
     week_number = db.Column(db.Integer, nullable=True)
 
     # 👤 Datos del autor (vienen desde Infinity)
@@ -36,10 +67,63 @@ class Post(db.Model):
     # 🌟 Nuevo campo para slug
     slug = db.Column(db.String(255), unique=True, nullable=False)
 
+    # 🔎 Índice de búsqueda: lo mantiene app/utils/search.py en cada flush.
+    # En SQLite queda vacío y se usa la tabla FTS5 posts_fts
+    search_vector = db.deferred(db.Column(TSVECTOR().with_variant(db.Text, "sqlite"), nullable=True))
+
+    # 📨 JSON ya serializado de la fila resumida (ver app/utils/payloads.py)
+    summary_json = db.deferred(db.Column(db.Text, nullable=True))
+
     # ⏰ Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
+    # 📋 Columnas de la fila resumida que leen los listados
+    SUMMARY_COLUMNS = (
+        "id", "title", "slug", "description", "category", "created_at",
+        "featured_image", "user_name", "word_count", "reading_time", "excerpt",
+    )
+
+    @validates("category")
+    def _set_category_key(self, key, category):
+        self.category_key = normalize_category(category)
+        return category
+
+    @property
+    def content_blocks(self):
+        return self.body.content_blocks if self.body is not None else []
+
+    @content_blocks.setter
+    def content_blocks(self, blocks):
+        self.set_content(blocks)
+
+    def set_content(self, blocks, metrics=None):
+        """
+        Guarda los bloques junto con sus métricas derivadas. `metrics` es el
+        resultado de analyze_blocks si el llamador ya lo calculó (p. ej. para
+        validar el largo), así los bloques se recorren una sola vez.
+        """
+        metrics = metrics or analyze_blocks(blocks)
+        if self.body is None:
+            self.body = PostBody(content_blocks=blocks)
+        else:
+            self.body.content_blocks = blocks
+        self.body.toc = metrics["toc"]
+        self.body.image_refs = metrics["image_refs"]
+        self.word_count = metrics["word_count"]
+        self.reading_time = metrics["reading_time"]
+        self.excerpt = metrics["excerpt"]
+
+    @classmethod
+    def summary_query(cls):
+        """Query que solo trae el resumen pre-serializado (y las claves del cursor)"""
+        return cls.query.options(load_only(cls.id, cls.created_at, cls.summary_json))
+
+    @classmethod
+    def detail_query(cls):
+        """Query que trae el post junto con su cuerpo en un solo SELECT"""
+        return cls.query.options(joinedload(cls.body))
+
     # ✅ Método para devolverlo como JSON-friendly dict
     def to_dict(self):
         return {
@@ -58,5 +142,67 @@ class Post(db.Model):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
 
+    def to_summary_dict(self):
+        """Fila de los listados (solo usa SUMMARY_COLUMNS)"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "slug": self.slug,
+            "description": self.description,
+            "category": self.category,
+            "created_at": self.created_at.isoformat(),
+            "featured_image": self.featured_image,
+            "user_name": self.user_name,
+            "word_count": self.word_count,
+            "reading_time": self.reading_time,
+            "excerpt": self.excerpt
+        }
+
+    def to_detail_dict(self):
+        """Payload público de GET /posts/<id|slug>"""
+        return {
+            "id": self.id,
+            "slug": self.slug,
+            "title": self.title,
+            "description": self.description,
+            "keywords": self.keywords,
+            "category": self.category,
+            "featured_image": self.featured_image,
+            "content_blocks": self.content_blocks,
+            "word_count": self.word_count,
+            "reading_time": self.reading_time,
+            "toc": self.body.toc if self.body is not None else [],
+            "image_refs": self.body.image_refs if self.body is not None else [],
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "author": self.user_name
+        }
+
     def __repr__(self):
         return f"<Post {self.title}>"
+
+
+class PostBody(db.Model):
+    """Cuerpo pesado del post (content_blocks), separado de la fila caliente"""
+    __tablename__ = "post_bodies"
+    __table_args__ = (
+        # 🧱 Filtros por bloque (@>) en Postgres; ver app/utils/block_filters.py
+        db.Index(
+            "ix_post_bodies_content_blocks", "content_blocks",
+            postgresql_using="gin", postgresql_ops={"content_blocks": "jsonb_path_ops"},
+        ),
+    )
+
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    # JSONB en Postgres (binario e indexable); JSON en SQLite
+    content_blocks = db.Column(db.JSON().with_variant(JSONB, "postgresql"), nullable=False, default=[])
+    # Índice y referencias a imágenes, derivados de content_blocks
+    toc = db.Column(JSON, nullable=False, default=[])
+    image_refs = db.Column(JSON, nullable=False, default=[])
+    # 📨 JSON ya serializado del detalle público (ver app/utils/payloads.py)
+    detail_json = db.deferred(db.Column(db.Text, nullable=True))
+
+    post = db.relationship("Post", back_populates="body")
+
+    def __repr__(self):
+        return f"<PostBody {self.post_id}>"
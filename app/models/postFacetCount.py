@@ -0,0 +1,18 @@
+from app.extensions import db
+
+
+class PostFacetCount(db.Model):
+    """
+    Conteo de posts por faceta (categoría / compañía). Se mantiene con
+    deltas en cada flush (ver app/utils/facets.py), así /posts/facets no
+    hace GROUP BY sobre posts.
+    """
+    __tablename__ = "post_facet_counts"
+
+    facet = db.Column(db.String(20), primary_key=True)      # "category" | "company"
+    value = db.Column(db.String(100), primary_key=True)     # category_key o company_id
+    label = db.Column(db.String(100), nullable=True)        # categoría tal como se escribió
+    post_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PostFacetCount {self.facet}={self.value}: {self.post_count}>"
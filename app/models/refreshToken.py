@@ -0,0 +1,34 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class RefreshToken(db.Model):
+    """
+    Refresh token rotativo. Solo se guarda el sha256 del token. Cada
+    rotación revoca el token usado y crea uno nuevo de la misma familia;
+    si un token ya rotado se vuelve a usar, se revoca toda la familia.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("blog_users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), nullable=False, unique=True)
+    family_id = db.Column(db.String(32), nullable=False, index=True)
+
+    # Claims de Infinity validados en el último login con contraseña
+    membership_level = db.Column(db.String(20), nullable=False)
+    is_admin = db.Column(db.Boolean, nullable=False, default=False)
+    is_buyer = db.Column(db.Boolean, nullable=False, default=False)
+    is_seller = db.Column(db.Boolean, nullable=False, default=False)
+    membership_validated_at = db.Column(db.DateTime, nullable=False)
+
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    replaced_by_id = db.Column(db.Integer, db.ForeignKey("refresh_tokens.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user = db.relationship("BlogUser")
+    replaced_by = db.relationship("RefreshToken", remote_side=[id])
+
+    def __repr__(self):
+        return f"<RefreshToken {self.id} user={self.user_id} family={self.family_id}>"
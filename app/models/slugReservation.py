@@ -0,0 +1,12 @@
+from app.extensions import db
+
+
+class SlugReservation(db.Model):
+    """Último sufijo reservado para cada slug base (base-<n>-<user_id>)"""
+    __tablename__ = "slug_reservations"
+
+    base_slug = db.Column(db.String(255), primary_key=True)
+    last_suffix = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SlugReservation {self.base_slug} {self.last_suffix}>"
@@ -0,0 +1,14 @@
+from app.extensions import db
+
+
+class WeeklyPostQuota(db.Model):
+    """Posts creados por usuario en cada semana ISO (año + semana)"""
+    __tablename__ = "weekly_post_quotas"
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    iso_year = db.Column(db.Integer, primary_key=True)
+    iso_week = db.Column(db.Integer, primary_key=True)
+    post_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<WeeklyPostQuota {self.user_id} {self.iso_year}-W{self.iso_week}: {self.post_count}>"
@@ -1,15 +1,20 @@
 # app/routes/auth.py
 from flask import Blueprint, request, jsonify
-import requests
-import jwt
-import os
-from datetime import datetime, timedelta
-from app.extensions import db
+import logging
+from app.extensions import db, infinity
 from app.models.blogUser import BlogUser
+from app.utils.log import log_event
+from app.utils.infinity import InfinityUnavailable
+from app.auth.tokens import issue_access_token
+from app.auth.refresh_tokens import (
+    RefreshTokenError,
+    issue_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_token
+)
 
 auth_bp = Blueprint("auth", __name__)
-
-INFINITY_LOGIN_URL = "https://infinity-gainers.onrender.com/users/login"  # login Infinity
+logger = logging.getLogger(__name__)
 
 def normalize_membership(name):
     mapping = {
@@ -23,8 +28,21 @@ def normalize_membership(name):
         return "platinum"
     return mapping.get(name.strip().lower(), "platinum")
 
+def _user_payload(user, membership_level, is_admin, is_buyer, is_seller):
+    return {
+        "id": user.id,
+        "username": user.username,
+        "role": user.role,
+        "membership_level": membership_level,
+        "is_admin": is_admin,
+        "is_buyer": is_buyer,
+        "is_seller": is_seller
+    }
+
 @auth_bp.route("/", methods=["POST"])
 def login():
+    import requests  # diferido: solo lo necesita el login
+
     data = request.get_json()
     email = data.get("email")
     password = data.get("password")
@@ -34,7 +52,10 @@ def login():
 
     try:
         # 🔐 Login en Infinity
-        response = requests.post(INFINITY_LOGIN_URL, json={"email": email, "password": password}, timeout=5)
+        response = infinity.login(email, password)
+        if response.status_code >= 500:
+            log_event(logger, "auth.infinity_error", level=logging.WARNING, status=response.status_code)
+            return jsonify({"error": "Error de conexión con Infinity"}), 502
         if response.status_code != 200:
             return jsonify({"error": "Invalid credentials"}), 401
 
@@ -63,40 +84,72 @@ def login():
         else:
             user.email = email
             user.role = "admin" if is_admin else "user"
+        db.session.flush()
+
+        # 🔄 Refresh token: permite renovar el access token sin volver a Infinity
+        refresh_token, _ = issue_refresh_token(
+            user, membership_level, is_admin=is_admin, is_buyer=is_buyer, is_seller=is_seller
+        )
         db.session.commit()
 
         # 🛡️ Generar JWT
-        token_payload = {
-            "sub": str(user.id),
-            "username": user.username,
-            "role": user.role,
-            "membership_level": membership_level,
-            "is_admin": is_admin,
-            "is_buyer": is_buyer,
-            "is_seller": is_seller,
-            "exp": datetime.utcnow() + timedelta(hours=8)
-        }
-
-        token = jwt.encode(token_payload, os.environ.get("JWT_SECRET_KEY"), algorithm="HS256")
+        token, expires_in = issue_access_token(
+            user, membership_level, is_admin=is_admin, is_buyer=is_buyer, is_seller=is_seller
+        )
 
-        print(f"✅ Login exitoso: {user.username} / Nivel: {membership_level}")
+        log_event(logger, "auth.login_ok", user_id=user.id, membership_level=membership_level)
 
         return jsonify({
             "access_token": token,
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "role": user.role,
-                "membership_level": membership_level,
-                "is_admin": is_admin,
-                "is_buyer": is_buyer,
-                "is_seller": is_seller
-            }
+            "expires_in": expires_in,
+            "refresh_token": refresh_token,
+            "user": _user_payload(user, membership_level, is_admin, is_buyer, is_seller)
         })
 
+    except InfinityUnavailable:
+        log_event(logger, "auth.infinity_circuit_open", level=logging.WARNING)
+        return jsonify({"error": "Infinity no disponible, intentá de nuevo en unos segundos"}), 503
     except requests.exceptions.RequestException as e:
-        print(f"⚠️ Error de conexión con Infinity: {e}")
+        log_event(logger, "auth.infinity_unreachable", level=logging.WARNING, error=str(e))
         return jsonify({"error": "Error de conexión con Infinity"}), 502
     except Exception as e:
-        print(f"❌ Error inesperado en login: {e}")
-        return jsonify({"error": "Error interno en login"}), 500
\ No newline at end of file
+        logger.exception("auth.login_failed")
+        return jsonify({"error": "Error interno en login"}), 500
+
+
+# 🔄 Renovar el access token con un refresh token (rota el refresh token)
+@auth_bp.route("/refresh", methods=["POST"])
+def refresh():
+    data = request.get_json() or {}
+    raw = data.get("refresh_token")
+    if not raw:
+        return jsonify({"error": "refresh_token requerido"}), 400
+
+    try:
+        new_refresh, record = rotate_refresh_token(raw)
+        db.session.commit()
+    except RefreshTokenError as e:
+        db.session.rollback()
+        log_event(logger, "auth.refresh_rejected", level=logging.INFO, reason=str(e))
+        return jsonify({"error": str(e), "reauth": e.reauth}), 401
+
+    user = record.user
+    token, expires_in = issue_access_token(
+        user, record.membership_level,
+        is_admin=record.is_admin, is_buyer=record.is_buyer, is_seller=record.is_seller
+    )
+    return jsonify({
+        "access_token": token,
+        "expires_in": expires_in,
+        "refresh_token": new_refresh,
+        "user": _user_payload(user, record.membership_level, record.is_admin, record.is_buyer, record.is_seller)
+    })
+
+
+# 🚪 Logout: revoca la familia del refresh token
+@auth_bp.route("/logout", methods=["POST"])
+def logout():
+    data = request.get_json() or {}
+    revoke_refresh_token(data.get("refresh_token"))
+    db.session.commit()
+    return jsonify({"message": "Sesión cerrada"}), 200
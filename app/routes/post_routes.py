@@ -1,36 +1,40 @@
+import logging
 from datetime import datetime
-from flask import Blueprint, request, jsonify, g
-from app.extensions import db
-from app.models.post import Post
-from slugify import slugify
-from app.auth.decorators import login_required, membership_required, jwt_required_local
+from flask import Blueprint, request, jsonify, g, current_app, stream_with_context
+from app.extensions import db, post_cache
+from app.models.post import Post, PostBody, normalize_category
+from sqlalchemy.orm import selectinload
+from app.auth.decorators import login_required, membership_required, jwt_required_local, admin_required
 from app.utils.membership_rules import (
-    can_user_post,
+    reserve_weekly_posts,
+    release_weekly_post,
     validate_post_length,
     get_current_week_number,
-    count_words_from_blocks,
     get_membership_limits  # <-- reemplaza get_word_limit
 )
+from app.utils.pagination import InvalidCursor, keyset_page, wants_total
+from app.utils.slugs import allocate_unique_slugs, save_with_unique_slug
+from app.utils.log import log_event
+from app.utils.media_assets import (
+    AssetUnavailable, acquire_assets, acquire_post_assets, post_public_ids, release_post_assets,
+)
+from app.utils.search import search_posts
+from app.utils.facets import get_facets
+from app.utils.transfer import iter_export_lines
+from app.utils.content import analyze_blocks
+from app.utils.block_filters import filter_has_block, filter_references_public_id
+from app.utils.payloads import encode_payload, extend_fragment, json_list_payload, summary_fragment
+from app.utils.db_routing import replica_reads
 
 post_bp = Blueprint("posts", __name__)
-
-def generate_unique_slug(title, user_id):
-    """Genera un slug único agregando timestamp si ya existe"""
-    base_slug = slugify(title)
-    slug = base_slug
-    i = 1
-    while Post.query.filter_by(slug=slug).first():
-        slug = f"{base_slug}-{i}-{user_id}"
-        i += 1
-    return slug
+logger = logging.getLogger(__name__)
 
 # 🟢 Crear un nuevo post
 @post_bp.route("/", methods=["POST"])
 @jwt_required_local
 @membership_required(["platinum", "gold", "silver", "bronze"])
 def create_post():
-    user = g.current_user.copy()
-    user["membership_level"] = user.get("membership_level", "bronze").replace(" ", "").lower()
+    user = g.current_user
 
     data = request.get_json() or {}
     week_number = get_current_week_number()
@@ -41,14 +45,10 @@ def create_post():
     if missing:
         return jsonify({"error": f"Faltan campos obligatorios: {', '.join(missing)}"}), 400
 
-    # Validar límite semanal
-    current_week_posts = Post.query.filter_by(user_id=user["id"], week_number=week_number).count()
-    if not can_user_post(user, current_week_posts):
-        return jsonify({"error": "Has alcanzado tu límite de publicaciones semanales."}), 403
-
-    # Contar palabras
+    # Métricas del contenido (palabras, lectura, índice...) en una sola pasada
     content_blocks = data.get("content_blocks", [])
-    word_count = count_words_from_blocks(content_blocks)
+    metrics = analyze_blocks(content_blocks)
+    word_count = metrics["word_count"]
     if not validate_post_length(user, word_count):
         return jsonify({
             "error": "Superaste el límite de palabras permitido para tu membresía.",
@@ -56,15 +56,8 @@ def create_post():
             "used": word_count
         }), 400
 
-    # Slug único
-    slug = generate_unique_slug(data["title"], user["id"])
-    print("✅ Membership real esto es desde el post:", g.current_user["membership_level"])
-    print("Tipo de g.current_user esto es desde el post:", type(g.current_user))
-    print("📝 current_week_posts:", current_week_posts)
-    print("📝 can_user_post:", can_user_post(user, current_week_posts))
-    print("📝 validate_post_length:", validate_post_length(user, word_count))
-    print("📝 word_count:", word_count)
-    print("📝 membership_level limpio:", user.get("membership_level").lower())
+    log_event(logger, "post.create.checks", level=logging.DEBUG, sampled=True,
+              user_id=user["id"], membership_level=user["membership_level"], word_count=word_count)
 
     # Imagen destacada (Cloudinary) opcional
     featured_image_url = data.get("featured_image")  # frontend ya subió la imagen y envía la URL
@@ -79,29 +72,131 @@ def create_post():
         company_id=data.get("company_id"),
         featured_image=featured_image_url,
         featured_image_public_id=featured_image_public_id,
-        content_blocks=content_blocks,
         user_id=user["id"],
         user_name=user["username"],
-        word_count=word_count,
-        week_number=week_number,
-        slug=slug
+        week_number=week_number
     )
+    new_post.set_content(content_blocks, metrics)
 
     try:
-        db.session.add(new_post)
+        # Validar y reservar el cupo semanal en la misma transacción del insert
+        if not reserve_weekly_posts(user):
+            db.session.rollback()
+            return jsonify({"error": "Has alcanzado tu límite de publicaciones semanales."}), 403
+
+        acquire_post_assets([new_post])
+
+        # Slug único (con reintento si otro create ganó la carrera)
+        save_with_unique_slug(new_post, data["title"], user["id"])
         db.session.commit()
         return jsonify({"message": "Post creado exitosamente", "data": new_post.to_dict()}), 201
+    except AssetUnavailable as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "public_id": e.public_id}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Error al guardar el post", "details": str(e)}), 500
 
 
 
+# 🟢🟢 Crear varios posts en una sola transacción (sindicación de partners)
+@post_bp.route("/bulk", methods=["POST"])
+@jwt_required_local
+@membership_required(["platinum", "gold", "silver", "bronze"])
+def create_posts_bulk():
+    user = g.current_user
+    data = request.get_json(silent=True) or {}
+    items = data.get("posts") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Se esperaba una lista no vacía en 'posts'"}), 400
+
+    max_items = current_app.config.get("POST_BULK_MAX_ITEMS", 50)
+    if len(items) > max_items:
+        return jsonify({"error": f"Se permiten como máximo {max_items} posts por request"}), 400
+
+    # 📏 Validar cada item; los inválidos se informan y no se crean
+    week_number = get_current_week_number()
+    results = [{"index": i} for i in range(len(items))]
+    valid = []
+    for index, item in enumerate(items):
+        error, metrics = _validate_bulk_item(item, user)
+        if error:
+            results[index]["error"] = error
+            continue
+        post = Post(
+            title=item["title"],
+            description=item["description"],
+            keywords=item.get("keywords"),
+            category=item.get("category"),
+            company_id=item.get("company_id"),
+            featured_image=item.get("featured_image"),
+            featured_image_public_id=item.get("featured_image_public_id"),
+            user_id=user["id"],
+            user_name=user["username"],
+            week_number=week_number
+        )
+        post.set_content(item["content_blocks"], metrics)
+        valid.append((index, post))
+
+    if not valid:
+        return jsonify({"error": "Ningún post es válido", "posts": results}), 400
+
+    try:
+        # El cupo semanal se valida y reserva para el lote entero de una vez
+        if not reserve_weekly_posts(user, count=len(valid)):
+            db.session.rollback()
+            return jsonify({
+                "error": "El lote supera tu límite de publicaciones semanales.",
+                "requested": len(valid)
+            }), 403
+
+        posts = [post for _, post in valid]
+        slugs = allocate_unique_slugs([(p.title, p.user_id) for p in posts])
+        for post, slug in zip(posts, slugs):
+            post.slug = slug
+        acquire_post_assets(posts)
+
+        # Un solo flush: en Postgres el ORM agrupa los INSERT en sentencias
+        # multi-fila (insertmanyvalues) y trae los ids con RETURNING
+        db.session.add_all(posts)
+        db.session.flush()
+        for index, post in valid:
+            results[index].update(id=post.id, slug=post.slug)
+        db.session.commit()
+    except AssetUnavailable as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "public_id": e.public_id}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": "Error al guardar los posts", "details": str(e)}), 500
+
+    log_event(logger, "post.bulk_create", user_id=user["id"], created=len(valid),
+              failed=len(items) - len(valid))
+    status = 201 if len(valid) == len(items) else 207
+    return jsonify({"posts": results}), status
+
+
+def _validate_bulk_item(item, user):
+    """Devuelve (error, métricas) de un item de /posts/bulk; error es None si es válido"""
+    if not isinstance(item, dict):
+        return "Cada post debe ser un objeto", None
+    missing = [f for f in ("title", "description", "content_blocks") if not item.get(f)]
+    if missing:
+        return f"Faltan campos obligatorios: {', '.join(missing)}", None
+    if not isinstance(item["content_blocks"], list):
+        return "content_blocks debe ser una lista", None
+    metrics = analyze_blocks(item["content_blocks"])
+    if not validate_post_length(user, metrics["word_count"]):
+        limit = get_membership_limits(user["membership_level"])["max_words_per_post"]
+        return f"Superaste el límite de palabras permitido para tu membresía ({metrics['word_count']}/{limit}).", None
+    return None, metrics
+
+
 # 🟡 Editar post (solo dueño o admin)
 @post_bp.route("/<int:id>", methods=["PUT"])
 @login_required
 def edit_post(id):
-    post = Post.query.get_or_404(id)
+    post = Post.detail_query().get_or_404(id)
     user = g.current_user
 
     # 🔒 Validar permisos
@@ -110,10 +205,10 @@ def edit_post(id):
 
     # 📦 Obtener datos
     data = request.get_json() or {}
-    new_blocks = data.get("content_blocks", post.content_blocks)
 
-    # 📏 Contar palabras y validar límite por membresía
-    word_count = count_words_from_blocks(new_blocks)
+    # 📏 Validar límite por membresía (solo se re-analiza si cambió el contenido)
+    metrics = analyze_blocks(data["content_blocks"]) if "content_blocks" in data else None
+    word_count = metrics["word_count"] if metrics else post.word_count
     if not validate_post_length(user, word_count):
         return jsonify({
             "error": "Superaste el límite de palabras permitido para tu membresía.",
@@ -121,111 +216,205 @@ def edit_post(id):
             "used": word_count
         }), 400
 
-    # 🔠 Guardar título original antes de modificarlo
+    # 🔠 Guardar título, slug e imágenes originales antes de modificarlos
     old_title = post.title
+    old_slug = post.slug
+    old_public_ids = post_public_ids(post)
 
     # 📝 Actualizar campos editables
     post.title = data.get("title", post.title)
     post.description = data.get("description", post.description)
     post.keywords = data.get("keywords", post.keywords)
     post.category = data.get("category", post.category)
-    post.content_blocks = new_blocks
-    post.word_count = word_count
+    if metrics:
+        post.set_content(data["content_blocks"], metrics)
     post.updated_at = datetime.utcnow()
 
     # 🖼️ Imagen destacada (solo si viene explícitamente en la data)
     # Aquí se actualiza solo si el front ya tiene la URL final de la imagen subida
     if "featured_image" in data:
         post.featured_image = data["featured_image"] or None
-
-    # 🧭 Actualizar slug si el título cambió (y solo si realmente cambió)
-    if "title" in data and data["title"] != old_title:
-        post.slug = generate_unique_slug(data["title"], user["id"])
+    new_public_id = data.get("featured_image_public_id", post.featured_image_public_id)
+    if "featured_image" in data and not post.featured_image:
+        new_public_id = None
+    post.featured_image_public_id = new_public_id
 
     try:
+        # ♻️ Mover las referencias (destacada + bloques) a las imágenes nuevas;
+        # las que quedaron sin posts van al outbox en esta transacción
+        new_public_ids = post_public_ids(post)
+        acquire_assets(new_public_ids - old_public_ids)
+        release_post_assets(old_public_ids - new_public_ids, post.id)
+
+        # 🧭 Actualizar slug si el título cambió (y solo si realmente cambió)
+        if "title" in data and data["title"] != old_title:
+            save_with_unique_slug(post, data["title"], user["id"])
+
         db.session.commit()
+        post_cache.invalidate(post.id, old_slug, post.slug)
         return jsonify({
             "message": "Post actualizado correctamente",
             "data": post.to_dict()
         }), 200
 
+    except AssetUnavailable as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "public_id": e.public_id}), 409
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error al actualizar post: {e}")
+        logger.exception("post.edit_failed", extra={"post_id": post.id})
         return jsonify({
             "error": "Error al actualizar el post",
             "details": str(e)
         }), 500
 
 
-
 # 🟣 Listar posts (paginado + filtros opcionales)
 @post_bp.route("/", methods=["GET"])
+@replica_reads
 def get_posts():
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 12, type=int), 20)  # máximo 50
         company_id = request.args.get("company_id", type=int)
         category = request.args.get("category", type=str)
+        has_block = request.args.get("has_block", type=str)
+        public_id = request.args.get("public_id", type=str)
 
-        query = Post.query
+        query = Post.summary_query()
 
         if company_id:
             query = query.filter_by(company_id=company_id)
-        # if category:
-        #     query = query.filter(Post.category.ilike(category))  # case-insensitive
+        if category:
+            # Igualdad sobre la clave normalizada (indexada), no ilike
+            query = query.filter(Post.category_key == normalize_category(category))
+        # 🧱 Filtros por bloques: ?has_block=image,video y ?public_id=<id de Cloudinary>
+        if has_block:
+            query = filter_has_block(query, [t.strip() for t in has_block.split(",") if t.strip()])
+        if public_id:
+            query = filter_references_public_id(query, public_id)
+
+        # 🔁 Modo cursor: ?after=<cursor> (vacío = primera página)
+        if "after" in request.args:
+            items, next_cursor = keyset_page(query, Post, request.args["after"], per_page)
+            meta = {"next_cursor": next_cursor, "per_page": per_page}
+            if wants_total(request.args):
+                meta["total"] = query.count()
+            # 📨 Los resúmenes ya vienen serializados: solo se concatenan
+            return _json_response(json_list_payload([summary_fragment(p) for p in items], **meta))
+
+        pagination = query.order_by(Post.created_at.desc(), Post.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
+
+        return _json_response(json_list_payload(
+            [summary_fragment(p) for p in pagination.items],
+            total=pagination.total,
+            page=pagination.page,
+            pages=pagination.pages,
+            per_page=pagination.per_page
+        ))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error al obtener los posts", "details": str(e)}), 500
 
-        pagination = query.order_by(Post.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
 
-        return jsonify({
-            "posts": [{
-                "id": p.id,
-                "title": p.title,
-                "slug": p.slug,
-                "description": p.description,
-                "category": p.category,
-                "created_at": p.created_at.isoformat(),
-                "featured_image": p.featured_image,
-                "user_name": p.user_name,
-                "word_count": p.word_count
-            } for p in pagination.items],
-            "total": pagination.total,
-            "page": pagination.page,
-            "pages": pagination.pages,
-            "per_page": pagination.per_page
-        }), 200
+# 📦 Export NDJSON de todos los posts (o filtrados): solo admins
+@post_bp.route("/export", methods=["GET"])
+@admin_required
+def export_posts():
+    try:
+        filters = {
+            "user_id": request.args.get("user_id", type=int),
+            "company_id": request.args.get("company_id", type=int),
+            "category": request.args.get("category", type=str),
+            "since": _parse_date_arg("since"),
+            "until": _parse_date_arg("until"),
+        }
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return current_app.response_class(
+        stream_with_context(iter_export_lines(**filters)),
+        mimetype="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=posts.ndjson"},
+    )
+
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} debe ser una fecha ISO (p. ej. 2025-01-31)")
+
+
+# 📊 Cantidad de posts por categoría y por compañía
+# Sin @replica_reads: llena facet_cache y no debe guardar datos con lag
+@post_bp.route("/facets", methods=["GET"])
+def facets():
+    try:
+        return jsonify(get_facets()), 200
     except Exception as e:
-        return jsonify({"error": "Error al obtener los posts", "details": str(e)}), 500
+        return jsonify({"error": "Error al obtener las facetas", "details": str(e)}), 500
+
+
+# 🔎 Búsqueda de texto completo: ?q=<texto>&after=<cursor>
+@post_bp.route("/search", methods=["GET"])
+@replica_reads
+def search():
+    q = request.args.get("q", "", type=str).strip()
+    if not q:
+        return jsonify({"error": "El parámetro q es obligatorio"}), 400
+
+    try:
+        per_page = min(request.args.get("per_page", 12, type=int), 20)
+        results, next_cursor = search_posts(q, request.args.get("after") or None, per_page)
+        fragments = [extend_fragment(summary_fragment(p), rank=rank, snippet=snippet)
+                     for p, rank, snippet in results]
+        return _json_response(json_list_payload(fragments, next_cursor=next_cursor, per_page=per_page))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error al buscar posts", "details": str(e)}), 500
 
 
 # 🔵 Ver un solo post (por ID o slug)
+# Sin @replica_reads: un miss se lee del primario porque el resultado queda
+# en post_cache (desde la réplica guardaría un detalle viejo tras invalidar)
 @post_bp.route("/<string:identifier>", methods=["GET"])
 def get_post_detail(identifier):
-    post = None
-    if identifier.isdigit():
-        post = Post.query.get(int(identifier))
-    else:
-        post = Post.query.filter_by(slug=identifier).first()
-
-    if not post:
+    # ⚡ Primero la caché (por id o slug): los artículos populares no tocan la DB
+    cached = post_cache.get(identifier)
+    if cached is not None:
+        return _json_response(cached)
+
+    # 📨 Solo se lee el detalle ya serializado
+    condition = Post.id == int(identifier) if identifier.isdigit() else Post.slug == identifier
+    row = db.session.execute(
+        db.select(Post.id, Post.slug, PostBody.detail_json)
+        .outerjoin(PostBody, PostBody.post_id == Post.id)
+        .where(condition)
+    ).first()
+
+    if not row:
         return jsonify({"error": "Post no encontrado"}), 404
 
-    return jsonify({
-        "id": post.id,
-        "slug": post.slug,
-        "title": post.title,
-        "description": post.description,
-        "keywords": post.keywords,
-        "category": post.category,
-        "featured_image": post.featured_image,
-        "content_blocks": post.content_blocks,
-        "created_at": post.created_at.isoformat(),
-        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-        "author": post.user_name
-    }), 200
+    payload = row.detail_json
+    if payload is None:
+        # Post anterior a los payloads guardados (ver `flask rebuild-posts`)
+        payload = encode_payload(Post.detail_query().get(row.id).to_detail_dict())
+    post_cache.store(row.id, row.slug, payload)
+    return _json_response(payload)
+
+
+def _json_response(payload, status=200):
+    return current_app.response_class(payload, status=status, mimetype="application/json")
 
 @post_bp.route("/my-posts", methods=["GET"])
 @login_required
+@replica_reads
 def get_my_posts():
     user = g.current_user
     page = request.args.get("page", 1, type=int)
@@ -236,8 +425,24 @@ def get_my_posts():
         query = Post.query
     else:
         query = Post.query.filter_by(user_id=user["id"])
-
-    pagination = query.order_by(Post.created_at.desc()) \
+    query = query.options(selectinload(Post.body))
+
+    # 🔁 Modo cursor: ?after=<cursor> (vacío = primera página)
+    if "after" in request.args:
+        try:
+            items, next_cursor = keyset_page(query, Post, request.args["after"], per_page)
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+        response = {
+            "posts": [p.to_dict() for p in items],
+            "next_cursor": next_cursor,
+            "per_page": per_page
+        }
+        if wants_total(request.args):
+            response["total"] = query.count()
+        return jsonify(response), 200
+
+    pagination = query.order_by(Post.created_at.desc(), Post.id.desc()) \
                       .paginate(page=page, per_page=per_page, error_out=False)
 
     return jsonify({
@@ -247,10 +452,6 @@ def get_my_posts():
         "pages": pagination.pages
     }), 200
 
-
-import cloudinary
-import cloudinary.uploader
-
 # 🔴 Borrar post (dueño o admin) + imagen en Cloudinary
 @post_bp.route("/<int:id>", methods=["DELETE"])
 @login_required
@@ -263,13 +464,16 @@ def delete_post(id):
         return jsonify({"error": "No autorizado"}), 403
 
     try:
-        # 🔹 Borrar imagen destacada de Cloudinary si existe
-        if post.featured_image_public_id:
-            cloudinary.uploader.destroy(post.featured_image_public_id)
+        # 🔹 Agendar el borrado de las imágenes (destacada y de los bloques) que
+        # ningún otro post usa (el outbox worker las borra después del commit)
+        release_post_assets(post_public_ids(post), post.id)
 
         # 🔹 Borrar post de la DB
+        post_id, slug = post.id, post.slug
+        release_weekly_post(post.user_id, post.created_at)
         db.session.delete(post)
         db.session.commit()
+        post_cache.invalidate(post_id, slug)
         return jsonify({"message": "Post y imagen eliminados correctamente"}), 200
 
     except Exception as e:
@@ -1,52 +1,163 @@
 # app/routes/upload_routes.py
-from flask import Blueprint, request, jsonify
-import cloudinary.uploader
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from flask import Blueprint, request, jsonify, current_app
 import filetype  # reemplaza imghdr
+import logging
+from app.extensions import db, media
+from app.utils.media_assets import hash_stream, find_assets, record_asset, revive_asset
 
 upload_bp = Blueprint("upload", __name__)
+logger = logging.getLogger(__name__)
 
 # Configuración
 ALLOWED_EXTENSIONS = ["jpeg", "jpg", "png", "webp", "gif"]
 MAX_SIZE = 150 * 1024  # 150 KB
+UPLOAD_FOLDER = "blog_featured_images"
 
-@upload_bp.route("/upload-image", methods=["POST"])
-def upload_image():
-    if "image" not in request.files:
-        return jsonify({"error": "No se encontró archivo 'image'"}), 400
+# Pool compartido (y acotado) para las subidas en lote; se crea en el primer uso
+_upload_pool = None
+_upload_pool_lock = threading.Lock()
 
-    file = request.files["image"]
 
-    # Validar tamaño
-    file.seek(0, 2)  # mover al final
-    size = file.tell()
-    file.seek(0)     # volver al inicio
+def get_upload_pool():
+    global _upload_pool
+    with _upload_pool_lock:
+        if _upload_pool is None:
+            _upload_pool = ThreadPoolExecutor(
+                max_workers=current_app.config.get("UPLOAD_MAX_WORKERS", 4),
+                thread_name_prefix="upload"
+            )
+        return _upload_pool
+
+
+def validate_image(file):
+    """
+    Valida tamaño y tipo mientras calcula el sha256 del contenido.
+    Devuelve (error, digest); error es None si la imagen es válida.
+    """
+    # Validar tamaño (el hash se calcula en la misma lectura)
+    digest, size = hash_stream(file, max_size=MAX_SIZE)
     if size > MAX_SIZE:
-        return jsonify({"error": "La imagen no puede superar los 150 KB"}), 400
+        return "La imagen no puede superar los 150 KB", None
 
     # Validar tipo
     kind = filetype.guess(file)
     if not kind or kind.extension not in ALLOWED_EXTENSIONS:
-        return jsonify({"error": f"Tipo de imagen no permitido: {kind.extension if kind else 'desconocido'}"}), 400
+        return f"Tipo de imagen no permitido: {kind.extension if kind else 'desconocido'}", None
+    return None, digest
 
-    try:
-        # Subir a Cloudinary
-        result = cloudinary.uploader.upload(
-            file,
-            folder="blog_featured_images",
-            resource_type="image"
-        )
 
-        url = result.get("secure_url")
-        public_id = result.get("public_id")
+def upload_to_cloudinary(client, file):
+    result = client.upload(
+        file,
+        folder=UPLOAD_FOLDER,
+        resource_type="image"
+    )
+
+    url = result.get("secure_url")
+    public_id = result.get("public_id")
+
+    if not url:
+        raise Exception("No se recibió URL de Cloudinary")
+
+    return {"url": url, "public_id": public_id}
 
-        if not url:
-            raise Exception("No se recibió URL de Cloudinary")
 
-        return jsonify({"url": url, "public_id": public_id}), 200
+@upload_bp.route("/upload-image", methods=["POST"])
+def upload_image():
+    if "image" not in request.files:
+        return jsonify({"error": "No se encontró archivo 'image'"}), 400
+
+    file = request.files["image"]
+
+    error, digest = validate_image(file)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # ♻️ Mismo contenido ya subido: devolver el asset existente sin ir a Cloudinary
+    # (si estaba sin posts se cancela su borrado; si ya se destruyó, se sube de nuevo)
+    known = find_assets([digest]).get(digest)
+    if known and (known.ref_count > 0 or revive_asset(known)):
+        db.session.commit()
+        return jsonify({**known.to_dict(), "deduplicated": True}), 200
+
+    try:
+        # Subir a Cloudinary
+        result = upload_to_cloudinary(media.client, file)
+        asset = record_asset(digest, result["url"], result["public_id"])
+        db.session.commit()
+        return jsonify(asset.to_dict()), 200
 
     except Exception as e:
-        print("❌ Error al subir imagen a Cloudinary:", e)
+        db.session.rollback()
+        logger.exception("upload.cloudinary_failed")
         return jsonify({
             "error": "Error al subir imagen",
             "details": str(e)
         }), 500
+
+
+# 🖼️ Subida de varias imágenes: se validan todas antes de subir nada y
+# las subidas corren en paralelo en el pool acotado
+@upload_bp.route("/upload-images", methods=["POST"])
+def upload_images():
+    files = request.files.getlist("images")
+    if not files:
+        return jsonify({"error": "No se encontraron archivos 'images'"}), 400
+
+    max_files = current_app.config.get("UPLOAD_MAX_BATCH_FILES", 10)
+    if len(files) > max_files:
+        return jsonify({"error": f"Se permiten como máximo {max_files} imágenes por request"}), 400
+
+    invalid = []
+    digests = []
+    for index, file in enumerate(files):
+        error, digest = validate_image(file)
+        if error:
+            invalid.append({"index": index, "filename": file.filename, "error": error})
+        digests.append(digest)
+    if invalid:
+        return jsonify({"error": "Hay archivos inválidos, no se subió ninguno", "files": invalid}), 400
+
+    # ♻️ Solo se sube una vez cada contenido que todavía no conocemos
+    known = {digest: asset for digest, asset in find_assets(digests).items()
+             if asset.ref_count > 0 or revive_asset(asset)}
+    client = media.client
+    pool = get_upload_pool()
+    futures = {}
+    for file, digest in zip(files, digests):
+        if digest not in known and digest not in futures:
+            futures[digest] = pool.submit(upload_to_cloudinary, client, file)
+
+    uploaded = {}
+    errors = {}
+    for digest, future in futures.items():
+        try:
+            result = future.result()
+            uploaded[digest] = record_asset(digest, result["url"], result["public_id"])
+        except Exception as e:
+            logger.exception("upload.cloudinary_failed", extra={"digest": digest})
+            errors[digest] = str(e)
+    db.session.commit()
+
+    results = []
+    failed = 0
+    for index, (file, digest) in enumerate(zip(files, digests)):
+        item = {"index": index, "filename": file.filename}
+        if digest in known:
+            item.update(known[digest].to_dict(), deduplicated=True)
+        elif digest in uploaded:
+            item.update(uploaded[digest].to_dict())
+        else:
+            failed += 1
+            item["error"] = errors[digest]
+        results.append(item)
+
+    if failed == len(files):
+        status = 502
+    elif failed:
+        status = 207
+    else:
+        status = 200
+    return jsonify({"files": results}), status
@@ -0,0 +1,51 @@
+# app/utils/block_filters.py
+"""
+Filtros de posts por el contenido de sus bloques, resueltos en la base.
+
+- Postgres: contención JSONB (content_blocks @> '[{"type": "image"}]'),
+  que usa el índice GIN jsonb_path_ops de post_bodies.
+- SQLite (local): json_each + json_extract sobre el arreglo de bloques.
+
+Cada función recibe una query de Post y devuelve la query filtrada.
+"""
+from sqlalchemy import exists, func, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.post import Post, PostBody
+from app.utils.sql import dialect_name
+
+
+def _block_exists(dialect, **match):
+    """Condición: algún bloque (o imagen de una galería) tiene todos los pares de `match`"""
+    if dialect == "postgresql":
+        blocks = type_coerce(PostBody.content_blocks, JSONB)
+        return or_(
+            blocks.contains([match]),
+            blocks.contains([{"images": [match]}]),
+        )
+
+    blocks = func.json_each(PostBody.content_blocks).table_valued("value").alias("blocks")
+    images = func.json_each(blocks.c.value, "$.images").table_valued("value").alias("images")
+    return or_(
+        exists(select(1).select_from(blocks).where(
+            *[func.json_extract(blocks.c.value, f"$.{key}") == value for key, value in match.items()]
+        )),
+        exists(select(1).select_from(blocks).join(images, func.json_type(blocks.c.value, "$.images") == "array").where(
+            *[func.json_extract(images.c.value, f"$.{key}") == value for key, value in match.items()]
+        )),
+    )
+
+
+def filter_has_block(query, block_types):
+    """Posts con al menos un bloque de alguno de los tipos dados (p. ej. image, video)"""
+    dialect = dialect_name(Post)
+    return query.filter(Post.body.has(or_(*[_block_exists(dialect, type=t) for t in block_types])))
+
+
+def filter_references_public_id(query, public_id):
+    """Posts que usan la imagen `public_id` como destacada o dentro de sus bloques"""
+    dialect = dialect_name(Post)
+    return query.filter(or_(
+        Post.featured_image_public_id == public_id,
+        Post.body.has(_block_exists(dialect, public_id=public_id)),
+    ))
@@ -0,0 +1,172 @@
+# app/utils/cache.py
+"""
+Caché de respuestas de posts.
+
+Backends:
+- LRUCache: en memoria del proceso, con TTL y tamaño máximo (por defecto).
+- RedisCache: compartido entre workers; recibe cualquier cliente con la
+  interfaz de redis-py (get / set(ex=) / delete / scan_iter), así que se
+  puede probar con un sustituto local.
+
+Con el backend en memoria, invalidate() solo limpia el worker que atendió
+la edición: si corre más de un worker (WEB_CONCURRENCY > 1) el TTL se
+acorta a POST_CACHE_LOCAL_TTL para que los demás no sirvan versiones viejas
+por mucho tiempo. Con POST_CACHE_URL configurada el backend por defecto es
+redis.
+
+Un error de Redis (caída, timeout) nunca llega al request: se loguea y
+get() cuenta como miss, set() / delete() como no-op.
+
+PostCache guarda el JSON ya serializado del detalle bajo dos claves
+(id y slug) para que las lecturas no toquen la base de datos.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+
+def _redis_errors():
+    """Errores del cliente que se tratan como miss / no-op"""
+    try:
+        import redis
+    except ImportError:
+        return (ConnectionError, TimeoutError)
+    return (redis.RedisError, ConnectionError, TimeoutError)
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    def __init__(self, client, ttl=300, prefix="blog:", errors=None):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.errors = errors or _redis_errors()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis  # dependencia opcional, solo si se usa este backend
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _failed(self, operation, error):
+        log_event(logger, "cache.redis_error", level=logging.WARNING,
+                  operation=operation, error=f"{type(error).__name__}: {error}")
+
+    def get(self, key):
+        try:
+            return self.client.get(self.prefix + key)
+        except self.errors as e:
+            self._failed("get", e)
+            return None
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.set(self.prefix + key, value, ex=self.ttl if ttl is None else ttl)
+        except self.errors as e:
+            self._failed("set", e)
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        try:
+            self.client.delete(*[self.prefix + k for k in keys])
+        except self.errors as e:
+            self._failed("delete", e)
+
+    def clear(self, batch_size=500):
+        """Borra todas las claves con el prefijo (SCAN, no bloquea el servidor como KEYS)"""
+        batch = []
+        for key in self.client.scan_iter(match=self.prefix + "*", count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class PostCache:
+    """Caché del detalle de posts, indexado por id y por slug"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def init_app(self, app, backend=None):
+        if backend is None:
+            kind = app.config.get("POST_CACHE_BACKEND", "memory")
+            ttl = app.config.get("POST_CACHE_TTL", 300)
+            if kind == "redis":
+                backend = RedisCache.from_url(app.config["POST_CACHE_URL"], ttl=ttl)
+            else:
+                if app.config.get("WEB_CONCURRENCY", 1) > 1:
+                    ttl = min(ttl, app.config.get("POST_CACHE_LOCAL_TTL", 5))
+                backend = LRUCache(maxsize=app.config.get("POST_CACHE_MAXSIZE", 1024), ttl=ttl)
+        self.backend = backend
+        app.extensions["post_cache"] = self
+
+    @staticmethod
+    def key_for(identifier):
+        identifier = str(identifier)
+        return f"post:id:{identifier}" if identifier.isdigit() else f"post:slug:{identifier}"
+
+    def get(self, identifier):
+        if self.backend is None:
+            return None
+        return self.backend.get(self.key_for(identifier))
+
+    def store(self, post_id, slug, payload):
+        if self.backend is None:
+            return
+        self.backend.set(self.key_for(post_id), payload)
+        if slug:
+            self.backend.set(self.key_for(slug), payload)
+
+    def invalidate(self, post_id, *slugs):
+        """Borra la entrada por id y por cada slug (p. ej. el viejo y el nuevo)"""
+        if self.backend is None:
+            return
+        keys = [self.key_for(post_id)] + [self.key_for(s) for s in set(slugs) if s]
+        self.backend.delete(*keys)
@@ -0,0 +1,135 @@
+# app/utils/content.py
+"""
+Procesamiento de content_blocks.
+
+Los bloques vienen del editor del front con formas distintas según el
+tipo (párrafo, título, lista, cita, imagen...). Acá se recorren todos y se
+extrae el texto plano que usan la búsqueda y las métricas.
+"""
+import math
+
+# Claves que contienen texto visible dentro de un bloque
+TEXT_KEYS = ("text", "content", "title", "heading", "caption", "quote", "items")
+
+
+def iter_block_text(blocks):
+    """Genera los fragmentos de texto de todos los bloques, en orden"""
+    for block in blocks or []:
+        if isinstance(block, str):
+            yield block
+        elif isinstance(block, dict):
+            for key in TEXT_KEYS:
+                yield from _iter_value(block.get(key))
+        elif isinstance(block, list):
+            yield from iter_block_text(block)
+
+
+def _iter_value(value):
+    if isinstance(value, str):
+        if value:
+            yield value
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                yield from iter_block_text([item])
+            else:
+                yield from _iter_value(item)
+
+
+def extract_text(blocks):
+    """Texto plano de todos los bloques, separado por saltos de línea"""
+    return "\n".join(iter_block_text(blocks))
+
+
+# 📐 Métricas derivadas: se calculan una vez por escritura (ver Post.set_content)
+
+WORDS_PER_MINUTE = 200
+EXCERPT_MAX_CHARS = 280
+
+HEADING_TYPES = {"heading", "header", "title", "subtitle", "h1", "h2", "h3", "h4", "h5", "h6"}
+IMAGE_TYPES = {"image", "gallery", "img", "figure"}
+IMAGE_URL_KEYS = ("url", "src", "image", "image_url")
+
+
+def count_words(blocks):
+    return sum(len(fragment.split()) for fragment in iter_block_text(blocks))
+
+
+def _anchor(text, used):
+    from slugify import slugify  # diferido: arranque más rápido
+
+    base = slugify(text) or "seccion"
+    anchor, n = base, 2
+    while anchor in used:
+        anchor, n = f"{base}-{n}", n + 1
+    used.add(anchor)
+    return anchor
+
+
+def _heading_level(block):
+    block_type = str(block.get("type", "")).lower()
+    level = block.get("level")
+    if level is None and len(block_type) == 2 and block_type[0] == "h" and block_type[1].isdigit():
+        level = int(block_type[1])
+    try:
+        return min(max(int(level), 1), 6)
+    except (TypeError, ValueError):
+        return 2
+
+
+def _image_refs(block):
+    refs = []
+    images = block.get("images") if isinstance(block.get("images"), list) else [block]
+    for image in images:
+        if not isinstance(image, dict):
+            continue
+        url = next((image[k] for k in IMAGE_URL_KEYS if isinstance(image.get(k), str) and image[k]), None)
+        public_id = image.get("public_id")
+        if url or public_id:
+            refs.append({"url": url, "public_id": public_id})
+    return refs
+
+
+def _truncate(text, max_chars):
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0].rstrip(".,;:") + "…"
+
+
+def analyze_blocks(blocks):
+    """
+    Recorre los bloques una sola vez y devuelve:
+    word_count, reading_time (minutos), excerpt (texto plano corto),
+    toc ([{level, text, anchor}]) e image_refs ([{url, public_id}]).
+    """
+    word_count = 0
+    excerpt_parts = []
+    toc = []
+    image_refs = []
+    anchors = set()
+
+    for block in blocks or []:
+        fragments = list(iter_block_text([block]))
+        word_count += sum(len(fragment.split()) for fragment in fragments)
+        if not isinstance(block, dict):
+            excerpt_parts.extend(fragments)
+            continue
+
+        block_type = str(block.get("type", "")).lower()
+        if block_type in HEADING_TYPES:
+            heading = " ".join(" ".join(fragments).split())
+            if heading:
+                toc.append({"level": _heading_level(block), "text": heading, "anchor": _anchor(heading, anchors)})
+        elif block_type in IMAGE_TYPES:
+            image_refs.extend(_image_refs(block))
+        elif sum(map(len, excerpt_parts)) < EXCERPT_MAX_CHARS:
+            excerpt_parts.extend(fragments)
+
+    return {
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0,
+        "excerpt": _truncate(" ".join(excerpt_parts), EXCERPT_MAX_CHARS),
+        "toc": toc,
+        "image_refs": image_refs,
+    }
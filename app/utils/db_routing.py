@@ -0,0 +1,91 @@
+# app/utils/db_routing.py
+"""
+Lecturas a la réplica, escrituras al primario.
+
+- Si DATABASE_REPLICA_URL está configurada existe el bind "replica".
+- Las vistas decoradas con @replica_reads mandan sus SELECT a la réplica.
+  Todo lo demás (escrituras, flush, UPDATE/DELETE, comandos de CLI y
+  cualquier vista sin el decorador) va al primario.
+- Read-after-write dentro del request: en cuanto la sesión hace un flush,
+  el resto del request lee del primario.
+- Read-after-write entre requests: un request que escribió deja la cookie
+  db_primary_until durante DB_REPLICA_STICKY_SECONDS; mientras esté vigente
+  las vistas de lectura de ese cliente también van al primario (cubre el
+  lag de replicación, p. ej. ver el post recién creado en /my-posts).
+
+- Las cachés (post_cache, facet_cache) solo se llenan desde el primario:
+  las vistas que guardan en ellas no llevan @replica_reads, si no un miss
+  justo después de una invalidación volvería a cachear el dato viejo.
+- Detrás del proxy de Render la app corre con ProxyFix (PROXY_HOPS), así
+  request.is_secure es verdadero y la cookie sale Secure; SameSite=None.
+
+Sin réplica configurada todo sigue yendo al primario.
+Para probarlo en local alcanzan dos SQLite, p. ej.
+DATABASE_URL=sqlite:////tmp/primary.db y DATABASE_REPLICA_URL=sqlite:////tmp/replica.db.
+"""
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "db_primary_until"
+
+
+class RoutingSession(Session):
+    """Sesión de Flask-SQLAlchemy que elige el engine de cada SELECT"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        return (
+            getattr(clause, "is_select", False)
+            and not self._flushing
+            and not self.info.get("db_wrote")
+            and has_app_context()
+            and g.get("db_route") == REPLICA_BIND
+        )
+
+
+def _mark_wrote(session, flush_context):
+    session.info["db_wrote"] = True
+
+
+def _sticky(req):
+    try:
+        return float(req.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_reads(f):
+    """La vista solo lee: sus SELECT van a la réplica (salvo read-after-write)"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not _sticky(request):
+            g.db_route = REPLICA_BIND
+        return f(*args, **kwargs)
+    return decorated
+
+
+def init_db_routing(app, db):
+    if not event.contains(db.session, "after_flush", _mark_wrote):
+        event.listen(db.session, "after_flush", _mark_wrote)
+
+    @app.after_request
+    def _stick_to_primary(response):
+        seconds = current_app.config.get("DB_REPLICA_STICKY_SECONDS", 0)
+        if seconds and REPLICA_BIND in db.engines and db.session.info.get("db_wrote"):
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time() + seconds)), max_age=seconds,
+                httponly=True, secure=request.is_secure,
+                samesite="None" if request.is_secure else "Lax",
+            )
+        return response
@@ -0,0 +1,179 @@
+# app/utils/facets.py
+"""
+Conteos de posts por categoría y por compañía para /posts/facets.
+
+No se calculan con GROUP BY: cada flush que crea, borra o cambia la
+categoría / compañía de un post aplica los deltas a post_facet_counts con
+un UPSERT, en la misma transacción. La respuesta además se cachea unos
+segundos por proceso (FACETS_CACHE_TTL).
+"""
+from collections import defaultdict
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+
+from app.config import Config
+from app.extensions import db
+from app.models.post import Post, normalize_category
+from app.models.postFacetCount import PostFacetCount
+from app.utils.cache import LRUCache
+from app.utils.sql import upsert
+
+CATEGORY = "category"
+COMPANY = "company"
+
+facet_cache = LRUCache(maxsize=1, ttl=Config.FACETS_CACHE_TTL)
+
+
+def _facet_values(category_key, company_id):
+    values = []
+    if category_key:
+        values.append((CATEGORY, category_key))
+    if company_id is not None:
+        values.append((COMPANY, str(company_id)))
+    return values
+
+
+def _old_and_new(post, attr):
+    """(valor_confirmado, valor_nuevo) de un atributo de un post modificado"""
+    history = inspect(post).attrs[attr].load_history()
+    old = history.deleted[0] if history.deleted else (history.unchanged[0] if history.unchanged else None)
+    new = history.added[0] if history.added else old
+    return old, new
+
+
+def _collect_deltas(session, flush_context, instances):
+    # Siempre de cero: un flush que falló (p. ej. el savepoint del reintento
+    # de slug) no llega a after_flush y sus deltas no deben sumarse al próximo
+    deltas = session.info["facet_deltas"] = defaultdict(int)
+    labels = session.info["facet_labels"] = {}
+
+    for post in session.new:
+        if isinstance(post, Post):
+            for key in _facet_values(post.category_key, post.company_id):
+                deltas[key] += 1
+            if post.category_key:
+                labels[(CATEGORY, post.category_key)] = post.category.strip()
+
+    for post in session.deleted:
+        if isinstance(post, Post):
+            for key in _facet_values(*_committed(post)):
+                deltas[key] -= 1
+
+    for post in session.dirty:
+        if not isinstance(post, Post) or post in session.deleted:
+            continue
+        old_category, new_category = _old_and_new(post, "category_key")
+        old_company, new_company = _old_and_new(post, "company_id")
+        if (old_category, old_company) == (new_category, new_company):
+            continue
+        for key in _facet_values(old_category, old_company):
+            deltas[key] -= 1
+        for key in _facet_values(new_category, new_company):
+            deltas[key] += 1
+        if new_category:
+            labels[(CATEGORY, new_category)] = post.category.strip()
+
+
+def _committed(post):
+    old_category, _ = _old_and_new(post, "category_key")
+    old_company, _ = _old_and_new(post, "company_id")
+    return old_category, old_company
+
+
+def _apply_deltas(session, flush_context):
+    deltas = session.info.pop("facet_deltas", None)
+    labels = session.info.pop("facet_labels", {})
+    changes = {key: delta for key, delta in (deltas or {}).items() if delta}
+    if not changes:
+        return
+
+    connection = session.connection(bind_arguments={"mapper": PostFacetCount})
+    for (facet, value), delta in sorted(changes.items()):
+        label = labels.get((facet, value))
+        stmt = upsert(PostFacetCount).values(
+            facet=facet, value=value, label=label, post_count=max(delta, 0)
+        )
+        set_ = {"post_count": PostFacetCount.post_count + delta}
+        if label:
+            set_["label"] = stmt.excluded.label
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[PostFacetCount.facet, PostFacetCount.value], set_=set_
+        ))
+    facet_cache.clear()
+
+
+def register_facet_listeners():
+    if not event.contains(db.session, "before_flush", _collect_deltas):
+        event.listen(db.session, "before_flush", _collect_deltas)
+        event.listen(db.session, "after_flush", _apply_deltas)
+
+
+def get_facets():
+    """{"categories": [...], "companies": [...]} ordenados por cantidad de posts"""
+    cached = facet_cache.get("facets")
+    if cached is not None:
+        return cached
+
+    rows = (
+        PostFacetCount.query
+        .filter(PostFacetCount.post_count > 0)
+        .order_by(PostFacetCount.facet, PostFacetCount.post_count.desc(), PostFacetCount.value)
+        .all()
+    )
+    facets = {"categories": [], "companies": []}
+    for row in rows:
+        if row.facet == CATEGORY:
+            facets["categories"].append({"key": row.value, "label": row.label or row.value, "count": row.post_count})
+        elif row.facet == COMPANY:
+            facets["companies"].append({"company_id": int(row.value), "count": row.post_count})
+
+    facet_cache.set("facets", facets)
+    return facets
+
+
+def backfill_category_keys(connection, batch_size=1000):
+    """
+    Recalcula posts.category_key con normalize_category, por lotes de id.
+    Lo usan la migración de category_key y `flask rebuild-facets`; devuelve
+    cuántos posts cambiaron de clave.
+    """
+    posts = Post.__table__
+    # updated_at = updated_at: que el onupdate de la columna no la toque
+    stmt = (update(posts).where(posts.c.id == bindparam("b_id"))
+            .values(category_key=bindparam("b_key"), updated_at=posts.c.updated_at))
+    last_id, changed = 0, 0
+    while True:
+        rows = connection.execute(
+            select(posts.c.id, posts.c.category, posts.c.category_key)
+            .where(posts.c.id > last_id).order_by(posts.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return changed
+        params = [{"b_id": row.id, "b_key": normalize_category(row.category)} for row in rows]
+        params = [p for p, row in zip(params, rows) if p["b_key"] != row.category_key]
+        if params:
+            connection.execute(stmt, params)
+            changed += len(params)
+        last_id = rows[-1].id
+
+
+def rebuild_facet_counts():
+    """Recalcula la tabla entera desde posts (reparación); no hace commit"""
+    PostFacetCount.query.delete(synchronize_session=False)
+    categories = (
+        db.session.query(Post.category_key, func.min(func.trim(Post.category)), func.count(Post.id))
+        .filter(Post.category_key.isnot(None))
+        .group_by(Post.category_key)
+    )
+    companies = (
+        db.session.query(Post.company_id, func.count(Post.id))
+        .filter(Post.company_id.isnot(None))
+        .group_by(Post.company_id)
+    )
+    rows = [PostFacetCount(facet=CATEGORY, value=key, label=label, post_count=count)
+            for key, label, count in categories]
+    rows += [PostFacetCount(facet=COMPANY, value=str(company_id), post_count=count)
+             for company_id, count in companies]
+    db.session.add_all(rows)
+    facet_cache.clear()
+    return len(rows)
@@ -0,0 +1,191 @@
+# app/utils/infinity.py
+"""
+Cliente del login de Infinity.
+
+- Una requests.Session por proceso con pool keep-alive (se crea en el
+  primer uso, así cada worker forkeado tiene la suya).
+- Timeouts separados de conexión y lectura.
+- Reintentos acotados solo donde es seguro: errores de conexión (la
+  request nunca llegó) y 502/503/504 del proxy de Render. Un timeout de
+  lectura no se reintenta.
+- Plazo total por login (INFINITY_LOGIN_DEADLINE): los reintentos y sus
+  timeouts nunca lo superan, así un login no queda colgado N veces el
+  timeout de lectura.
+- Circuit breaker: tras N fallos seguidos deja de llamar durante
+  `reset_timeout` segundos y falla al instante con InfinityUnavailable;
+  después deja pasar una request de prueba (half-open).
+"""
+import threading
+import time
+
+from app.utils.metrics import timed
+
+RETRY_STATUSES = frozenset({502, 503, 504})
+BACKOFF_FACTOR = 0.2
+# Tiempo mínimo que tiene que quedar del plazo para que valga la pena reintentar
+MIN_ATTEMPT_SECONDS = 0.5
+
+
+class InfinityUnavailable(Exception):
+    """Infinity está caído (circuito abierto); no se intentó la llamada."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """La llamada terminó sin resultado (error inesperado): otra puede probar"""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class InfinityClient:
+    def __init__(self):
+        self.login_url = None
+        self.timeout = (2.0, 5.0)
+        self.pool_size = 10
+        self.max_retries = 2
+        self.deadline = 6.0
+        self.breaker = CircuitBreaker()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def init_app(self, app, session=None):
+        self.login_url = app.config["INFINITY_LOGIN_URL"]
+        self.timeout = (app.config["INFINITY_CONNECT_TIMEOUT"], app.config["INFINITY_READ_TIMEOUT"])
+        self.pool_size = app.config["INFINITY_POOL_SIZE"]
+        self.max_retries = app.config["INFINITY_MAX_RETRIES"]
+        self.deadline = app.config["INFINITY_LOGIN_DEADLINE"]
+        self.breaker = CircuitBreaker(
+            failure_threshold=app.config["INFINITY_BREAKER_THRESHOLD"],
+            reset_timeout=app.config["INFINITY_BREAKER_RESET"],
+        )
+        # `session` permite inyectar un sustituto local (tests, benchmarks)
+        self._session = session
+        app.extensions["infinity"] = self
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                # requests se importa recién acá (arranque más rápido). Los
+                # reintentos los hace login() para respetar el plazo total
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def reset(self):
+        """Descarta la sesión (p. ej. tras un fork) y cierra el circuito"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+        self.breaker.record_success()
+
+    def login(self, email, password):
+        """
+        POST al login de Infinity. Devuelve la requests.Response; lanza
+        InfinityUnavailable con el circuito abierto y
+        requests.RequestException si la llamada falla.
+        """
+        import requests
+
+        if not self.breaker.allow():
+            raise InfinityUnavailable("Infinity no disponible (circuito abierto)")
+
+        recorded = False
+        try:
+            try:
+                with timed("infinity", "login"):
+                    response = self._post_within_deadline({"email": email, "password": password})
+            except requests.exceptions.RequestException:
+                self.breaker.record_failure()
+                recorded = True
+                raise
+
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            recorded = True
+            return response
+        finally:
+            if not recorded:
+                # Excepción inesperada: no dejar el half-open tomado para siempre
+                self.breaker.release_probe()
+
+    def _post_within_deadline(self, payload):
+        """
+        Hace el POST reintentando errores de conexión y 502/503/504 (hasta
+        max_retries) sin pasarse del plazo: cada intento usa como timeout lo
+        que queda del presupuesto. Un timeout de lectura no se reintenta.
+        """
+        import requests
+
+        deadline = time.monotonic() + self.deadline
+        connect_timeout, read_timeout = self.timeout
+        attempt = 0
+        while True:
+            remaining = max(deadline - time.monotonic(), 0.01)
+            try:
+                response = self.session.post(
+                    self.login_url,
+                    json=payload,
+                    timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)),
+                )
+            except requests.exceptions.ConnectionError:
+                # Incluye ConnectTimeout: la request nunca llegó
+                if not self._can_retry(attempt, deadline):
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or not self._can_retry(attempt, deadline):
+                    return response
+                response.close()
+            time.sleep(BACKOFF_FACTOR * (2 ** attempt))
+            attempt += 1
+
+    def _can_retry(self, attempt, deadline):
+        delay = BACKOFF_FACTOR * (2 ** attempt)
+        return attempt < self.max_retries and deadline - time.monotonic() - delay >= MIN_ATTEMPT_SECONDS
@@ -0,0 +1,140 @@
+# app/utils/log.py
+"""
+Logging estructurado y no bloqueante.
+
+Los módulos usan logging.getLogger(__name__) como siempre. configure_logging
+cuelga del logger "app" un QueueHandler con cola acotada: el request solo
+hace put_nowait (si la cola está llena el registro se descarta y se cuenta)
+y un QueueListener en un hilo aparte formatea a JSON y escribe a stdout.
+
+Configuración:
+- LOG_LEVEL: nivel por defecto del logger "app".
+- LOG_LEVELS: niveles por módulo, p. ej. "app.routes.post_routes=DEBUG,app.auth=WARNING".
+- LOG_DEBUG_SAMPLE_RATE: fracción (0-1) de eventos DEBUG muestreados que se emiten.
+- LOG_QUEUE_SIZE: tamaño máximo de la cola.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT_LOGGER = "app"
+
+# Atributos estándar de LogRecord que no se copian como campos extra
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "fields"}
+
+_state = {"listener": None, "handler": None, "sample_rate": 1.0}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler que nunca espera: si la cola está llena descarta el registro"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolver el mensaje y la traza acá; el formato JSON lo hace el listener
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_levels(spec):
+    """'a=DEBUG,b=INFO' -> {'a': 'DEBUG', 'b': 'INFO'}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def start_listener():
+    """(Re)arranca el hilo que vacía la cola; necesario de nuevo tras un fork"""
+    handler = _state["handler"]
+    if handler is None:
+        return
+    previous = _state["listener"]
+    if previous is not None:
+        thread = getattr(previous, "_thread", None)
+        if thread is not None and thread.is_alive():
+            try:
+                previous.stop()
+            except Exception:
+                pass
+        else:
+            # Hijo forkeado: el hilo del padre no existe acá y la cola (con
+            # su lock) puede haber quedado a medio usar; se empieza con una nueva
+            handler.queue = queue.Queue(maxsize=handler.queue.maxsize)
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(handler.queue, output, respect_handler_level=False)
+    listener.start()
+    _state["listener"] = listener
+
+
+def stop_listener():
+    if _state["listener"] is not None:
+        _state["listener"].stop()
+        _state["listener"] = None
+
+
+def configure_logging(app):
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+    for name, level in parse_levels(app.config.get("LOG_LEVELS")).items():
+        logging.getLogger(name).setLevel(level)
+    _state["sample_rate"] = float(app.config.get("LOG_DEBUG_SAMPLE_RATE", 1.0))
+
+    if _state["handler"] is None:
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=app.config.get("LOG_QUEUE_SIZE", 10000)))
+        root.addHandler(handler)
+        root.propagate = False
+        _state["handler"] = handler
+        start_listener()
+        atexit.register(stop_listener)
+
+
+def log_event(logger, event, level=logging.INFO, sampled=False, **fields):
+    """
+    Emite un evento estructurado. Con sampled=True (pensado para DEBUG en
+    caminos calientes) solo pasa una fracción LOG_DEBUG_SAMPLE_RATE, y el
+    descarte ocurre antes de construir el LogRecord.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sampled and random.random() >= _state["sample_rate"]:
+        return
+    logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,64 @@
+# app/utils/media.py
+"""
+Acceso a Cloudinary detrás de un cliente inyectable.
+
+Las rutas nunca llaman a cloudinary.uploader directamente: usan
+media.client, que por defecto es un CloudinaryClient y que se puede
+reemplazar por un fake local con media.init_app(app, client=...).
+Las llamadas del cliente real se miden en outbound_request_duration_seconds.
+El SDK de Cloudinary se importa y se configura recién en la primera llamada.
+"""
+import threading
+
+from flask import current_app
+
+from app.utils.metrics import timed
+
+
+class CloudinaryClient:
+    """Cliente real: delega en el SDK de Cloudinary"""
+
+    def __init__(self, cloud_name=None, api_key=None, api_secret=None):
+        self._credentials = {"cloud_name": cloud_name, "api_key": api_key, "api_secret": api_secret}
+        self._configured = False
+        self._lock = threading.Lock()
+
+    def _configure(self):
+        with self._lock:
+            if not self._configured:
+                import cloudinary
+                cloudinary.config(**self._credentials)
+                self._configured = True
+
+    def upload(self, file, **options):
+        self._configure()
+        import cloudinary.uploader
+        with timed("cloudinary", "upload"):
+            return cloudinary.uploader.upload(file, **options)
+
+    def destroy(self, public_id):
+        self._configure()
+        import cloudinary.uploader
+        with timed("cloudinary", "destroy"):
+            return cloudinary.uploader.destroy(public_id)
+
+    def delete_resources(self, public_ids):
+        """Borrado masivo (hasta 100 por llamada); devuelve {"deleted": {public_id: estado}}"""
+        self._configure()
+        import cloudinary.api
+        with timed("cloudinary", "delete_resources"):
+            return cloudinary.api.delete_resources(list(public_ids))
+
+
+class MediaStorage:
+    def init_app(self, app, client=None):
+        app.extensions["media_client"] = client or CloudinaryClient(
+            cloud_name=app.config.get("CLOUDINARY_CLOUD_NAME"),
+            api_key=app.config.get("CLOUDINARY_API_KEY"),
+            api_secret=app.config.get("CLOUDINARY_API_SECRET"),
+        )
+
+    @property
+    def client(self):
+        return current_app.extensions["media_client"]
+
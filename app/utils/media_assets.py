@@ -0,0 +1,221 @@
+# app/utils/media_assets.py
+"""
+Deduplicación de imágenes por contenido.
+
+media_assets guarda sha256 -> (url, public_id) y cuántos posts usan cada
+imagen: una imagen repetida no vuelve a Cloudinary y solo se destruye
+cuando ningún post la referencia. Un post usa su imagen destacada y las
+imágenes de sus bloques (PostBody.image_refs); cada imagen cuenta una vez
+por post. Antes de agendar un borrado se verifica además que ningún otro
+post la referencie (conteos de imágenes anteriores al conteo por bloques).
+
+Una imagen en 0 conserva su fila hasta que el worker del outbox la
+destruye: si un post la vuelve a usar antes (dedupe de un upload, o el
+post que la tenía se borró mientras se editaba otro), acquire cancela el
+borrado pendiente. Las subidas que nunca se usan las limpia
+`flask sweep-assets` pasado un TTL.
+"""
+import hashlib
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.assetDeletion import AssetDeletion
+from app.models.mediaAsset import MediaAsset
+from app.models.post import Post, PostBody
+from app.utils.block_filters import filter_references_public_id
+from app.utils.outbox import cancel_asset_deletions, enqueue_asset_deletion
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class AssetUnavailable(Exception):
+    """La imagen se destruyó en Cloudinary antes de que el post la tomara"""
+
+    def __init__(self, public_id):
+        super().__init__(f"la imagen {public_id} ya no está disponible, volvé a subirla")
+        self.public_id = public_id
+
+
+def hash_stream(file, max_size=None):
+    """
+    Lee el archivo por bloques calculando sha256 y tamaño; corta apenas
+    supera max_size. Devuelve (digest, size) y deja el stream al inicio.
+    """
+    sha = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    while True:
+        chunk = file.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            break
+        sha.update(chunk)
+    file.seek(0)
+    return sha.hexdigest(), size
+
+
+def find_assets(digests):
+    """digest -> MediaAsset para los digests ya conocidos (una sola consulta)"""
+    if not digests:
+        return {}
+    assets = MediaAsset.query.filter(MediaAsset.digest.in_(set(digests))).all()
+    return {a.digest: a for a in assets}
+
+
+def record_asset(digest, url, public_id):
+    """
+    Registra una imagen recién subida. Si otro request subió el mismo
+    contenido al mismo tiempo, se queda con el registro existente y
+    agenda el borrado de la copia duplicada.
+    """
+    asset = MediaAsset(digest=digest, url=url, public_id=public_id, ref_count=0)
+    try:
+        with db.session.begin_nested():
+            db.session.add(asset)
+        return asset
+    except IntegrityError:
+        existing = MediaAsset.query.filter_by(digest=digest).first()
+        if existing is None:
+            raise
+        if existing.public_id != public_id:
+            enqueue_asset_deletion(public_id)
+        return existing
+
+
+def acquire_asset(public_id, count=1):
+    """`count` posts más usan la imagen; devuelve False si no está registrada"""
+    if not public_id:
+        return False
+    result = db.session.execute(
+        db.update(MediaAsset)
+        .where(MediaAsset.public_id == public_id)
+        .values(ref_count=MediaAsset.ref_count + count)
+    )
+    return result.rowcount > 0
+
+
+def revive_asset(asset):
+    """
+    Dedupe de una imagen sin posts (subida y nunca usada, o de un post
+    borrado): cancela su borrado pendiente y reinicia el TTL de
+    sweep_unused_assets. Devuelve False si el worker ya la destruyó.
+    """
+    cancel_asset_deletions([asset.public_id])
+    result = db.session.execute(
+        db.update(MediaAsset).where(MediaAsset.id == asset.id).values(created_at=datetime.utcnow())
+    )
+    return result.rowcount > 0
+
+
+def release_asset(public_id):
+    """
+    Un post deja de usar la imagen. Devuelve True si ya nadie la usa y hay
+    que agendar su borrado en Cloudinary (la fila queda en 0 hasta que el
+    worker la destruya). Las imágenes anteriores a media_assets no tienen
+    conteo y se tratan como de un solo post.
+    """
+    if not public_id:
+        return False
+    asset = MediaAsset.query.filter_by(public_id=public_id).with_for_update().first()
+    if asset is None:
+        return True
+    asset.ref_count = max(asset.ref_count - 1, 0)
+    return asset.ref_count == 0
+
+
+def post_public_ids(post):
+    """public_ids de Cloudinary que usa un post: la destacada y las de sus bloques"""
+    refs = post.body.image_refs if post.body is not None else None
+    ids = {ref.get("public_id") for ref in refs or [] if isinstance(ref, dict)}
+    ids.add(post.featured_image_public_id)
+    return {public_id for public_id in ids if public_id}
+
+
+def acquire_assets(public_ids):
+    """
+    Suma referencias a las imágenes (un iterable, o un Counter con cuántos
+    posts nuevos usan cada una). Primero cancela los borrados pendientes de
+    las que estaban en 0; si alguna registrada ya se destruyó lanza
+    AssetUnavailable. Las no registradas (anteriores a media_assets) se
+    ignoran.
+    """
+    counts = Counter(public_ids)
+    counts.pop(None, None)
+    if not counts:
+        return
+    known = set(db.session.scalars(select(MediaAsset.public_id).where(MediaAsset.public_id.in_(counts))))
+    # Outbox antes que media_assets: mismo orden de locks que el worker
+    cancel_asset_deletions(known)
+    for public_id, count in counts.items():
+        if not acquire_asset(public_id, count) and public_id in known:
+            raise AssetUnavailable(public_id)
+
+
+def acquire_post_assets(posts):
+    """Suma las referencias de posts nuevos (una consulta por imagen distinta)"""
+    acquire_assets(Counter(public_id for post in posts for public_id in post_public_ids(post)))
+
+
+def _referenced_elsewhere(public_id, post_id):
+    query = filter_references_public_id(Post.query.filter(Post.id != post_id), public_id)
+    return db.session.query(query.exists()).scalar()
+
+
+def release_post_assets(public_ids, post_id):
+    """
+    El post `post_id` deja de usar `public_ids`. Agenda en el outbox el
+    borrado de las que quedaron sin uso y que ningún otro post referencia.
+    """
+    for public_id in public_ids:
+        if release_asset(public_id) and not _referenced_elsewhere(public_id, post_id):
+            enqueue_asset_deletion(public_id)
+
+
+def sweep_unused_assets(older_than):
+    """
+    Agenda el borrado de las imágenes sin posts desde hace más de
+    `older_than` (timedelta): subidas que nunca se usaron. Saltea las que
+    ya tienen un borrado pendiente o que algún post todavía referencia.
+    No hace commit; devuelve cuántas agendó.
+    """
+    cutoff = datetime.utcnow() - older_than
+    assets = (
+        MediaAsset.query
+        .filter(MediaAsset.ref_count == 0, MediaAsset.created_at < cutoff,
+                MediaAsset.public_id.not_in(select(AssetDeletion.public_id)))
+        .order_by(MediaAsset.id)
+        .all()
+    )
+    queued = 0
+    for asset in assets:
+        if not _referenced_elsewhere(asset.public_id, None):
+            enqueue_asset_deletion(asset.public_id)
+            queued += 1
+    return queued
+
+
+def recount_asset_refs():
+    """Recalcula ref_count de todas las imágenes desde los posts (reparación); no hace commit"""
+    counts = Counter()
+    rows = db.session.execute(
+        db.select(Post.featured_image_public_id, PostBody.image_refs)
+        .outerjoin(PostBody, PostBody.post_id == Post.id)
+        .execution_options(yield_per=1000)
+    )
+    for featured, refs in rows:
+        ids = {ref.get("public_id") for ref in refs or [] if isinstance(ref, dict)}
+        ids.add(featured)
+        counts.update(public_id for public_id in ids if public_id)
+
+    updated = 0
+    for asset in MediaAsset.query.all():
+        if asset.ref_count != counts.get(asset.public_id, 0):
+            asset.ref_count = counts.get(asset.public_id, 0)
+            updated += 1
+    return updated
@@ -1,5 +1,10 @@
-from datetime import datetime, timedelta
-from app.models import Post
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import update
+from app.extensions import db
+from app.models import WeeklyPostQuota
+from app.utils.sql import upsert
+from app.utils.content import count_words
 import math
 
 # Reglas base
@@ -18,13 +23,72 @@ def get_membership_limits(level):
     level = (level or "").replace(" ", "").lower()
     return MEMBERSHIP_RULES.get(level, MEMBERSHIP_RULES["bronze"])
 
+def get_current_iso_week(now=None):
+    """(año ISO, semana ISO); la semana sola se repite cada año"""
+    iso_year, iso_week, _ = (now or datetime.utcnow()).isocalendar()
+    return iso_year, iso_week
+
 def count_user_posts_this_week(user_id):
-    """Cuenta cuántos posts ha creado el usuario esta semana"""
-    start_of_week = datetime.utcnow() - timedelta(days=datetime.utcnow().weekday())
-    return Post.query.filter(
-        Post.user_id == user_id,
-        Post.created_at >= start_of_week
-    ).count()
+    """Cuenta cuántos posts ha creado el usuario esta semana (lectura O(1) del contador)"""
+    iso_year, iso_week = get_current_iso_week()
+    quota = db.session.get(WeeklyPostQuota, (int(user_id), iso_year, iso_week))
+    return quota.post_count if quota else 0
+
+def reserve_weekly_posts(user, count=1, now=None):
+    """
+    Suma `count` al contador semanal del usuario solo si no supera su
+    límite, en un único UPSERT condicional. Corre en la transacción del
+    insert del post: si el insert falla, la reserva se deshace con él, y
+    dos creates concurrentes no pueden pasarse del límite.
+    Devuelve True si la reserva entró.
+    """
+    limits = get_membership_limits(user.get("membership_level", "bronze"))
+    max_posts = limits["max_posts_per_week"]
+    if count > max_posts:
+        return False
+
+    iso_year, iso_week = get_current_iso_week(now)
+    stmt = upsert(WeeklyPostQuota).values(
+        user_id=int(user["id"]), iso_year=iso_year, iso_week=iso_week, post_count=count
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WeeklyPostQuota.user_id, WeeklyPostQuota.iso_year, WeeklyPostQuota.iso_week],
+        set_={"post_count": WeeklyPostQuota.post_count + count},
+        where=None if max_posts == math.inf else WeeklyPostQuota.post_count + count <= max_posts,
+    ).returning(WeeklyPostQuota.post_count)
+    return db.session.execute(stmt).scalar_one_or_none() is not None
+
+def add_weekly_posts(posts):
+    """
+    Suma posts ya creados (p. ej. importados) al contador de la semana de
+    su created_at, sin mirar el límite: así release_weekly_post descuenta
+    lo que se contó al borrarlos. `posts` son pares (user_id, created_at).
+    """
+    weeks = Counter((int(user_id), *get_current_iso_week(created_at)) for user_id, created_at in posts)
+    for (user_id, iso_year, iso_week), count in sorted(weeks.items()):
+        stmt = upsert(WeeklyPostQuota).values(
+            user_id=user_id, iso_year=iso_year, iso_week=iso_week, post_count=count
+        )
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[WeeklyPostQuota.user_id, WeeklyPostQuota.iso_year, WeeklyPostQuota.iso_week],
+            set_={"post_count": WeeklyPostQuota.post_count + count},
+        ))
+
+def release_weekly_post(user_id, created_at):
+    """Devuelve el cupo de la semana en que se creó un post borrado"""
+    if not created_at:
+        return
+    iso_year, iso_week = get_current_iso_week(created_at)
+    db.session.execute(
+        update(WeeklyPostQuota)
+        .where(
+            WeeklyPostQuota.user_id == int(user_id),
+            WeeklyPostQuota.iso_year == iso_year,
+            WeeklyPostQuota.iso_week == iso_week,
+            WeeklyPostQuota.post_count > 0,
+        )
+        .values(post_count=WeeklyPostQuota.post_count - 1)
+    )
 
 def can_user_post(user, current_week_posts):
     membership_level = user.get("membership_level", "bronze").replace(" ", "").lower()
@@ -37,12 +101,5 @@ def validate_post_length(user, word_count):
     return word_count <= limits["max_words_per_post"]
 
 def count_words_from_blocks(blocks):
-    total_words = 0
-    for block in blocks:
-        text = ""
-        if isinstance(block, dict):
-            text = block.get("text") or block.get("content") or ""
-        elif isinstance(block, str):
-            text = block
-        total_words += len(text.split())
-    return total_words
+    """Palabras de todos los bloques (listas, títulos y citas incluidos)"""
+    return count_words(blocks)
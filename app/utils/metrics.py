@@ -0,0 +1,255 @@
+# app/utils/metrics.py
+"""
+Métricas del proceso en formato de texto de Prometheus (GET /metrics).
+
+- Latencia por endpoint (regla de URL, método y status).
+- Sentencias SQL: cantidad y duración por endpoint, vía eventos del
+  engine de SQLAlchemy. sql_statements_per_request deja ver los N+1 (p. ej.
+  un loop de slugs) y cada respuesta trae un header Server-Timing con la
+  cantidad y el tiempo de SQL del request.
+- Llamadas salientes (Cloudinary, Infinity) con `timed(...)`.
+
+GET /metrics exige METRICS_TOKEN como Bearer; sin token responde 404
+salvo con METRICS_PUBLIC=true (o en debug / tests).
+
+Los valores son por proceso: con varios workers de gunicorn, Prometheus
+scrapea cada uno (o se agregan en el recolector).
+"""
+import hmac
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+from app.utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}   # labels -> [conteos por bucket..., suma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for label_values, state in items:
+            for bound, count in zip(self.buckets, state):
+                le = ("le", _format_number(bound))
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {count}"
+            yield f"{self.name}_bucket{_format_labels(self.labels, label_values, ('le', '+Inf'))} {state[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_number(state[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {state[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Latencia de los requests HTTP.",
+    labels=("endpoint", "method", "status"),
+))
+sql_statement_duration = registry.register(Histogram(
+    "sql_statement_duration_seconds", "Duración de cada sentencia SQL, por endpoint.",
+    labels=("endpoint",), buckets=SQL_BUCKETS,
+))
+sql_statements_per_request = registry.register(Histogram(
+    "sql_statements_per_request", "Sentencias SQL ejecutadas por request (detecta N+1).",
+    labels=("endpoint",), buckets=COUNT_BUCKETS,
+))
+outbound_request_duration = registry.register(Histogram(
+    "outbound_request_duration_seconds", "Latencia de las llamadas a servicios externos.",
+    labels=("service", "operation", "outcome"),
+))
+outbound_requests = registry.register(Counter(
+    "outbound_requests_total", "Llamadas a servicios externos.",
+    labels=("service", "operation", "outcome"),
+))
+
+
+def _endpoint():
+    """Regla de URL del request actual (cardinalidad acotada); "-" fuera de un request"""
+    if not has_app_context():
+        return "-"
+    return getattr(g, "metrics_endpoint", "-")
+
+
+@contextmanager
+def timed(service, operation):
+    """Mide una llamada saliente; outcome = ok / error según si lanzó excepción"""
+    outcome = "ok"
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        outbound_request_duration.observe(time.perf_counter() - t0, service, operation, outcome)
+        outbound_requests.inc(service, operation, outcome)
+
+
+# 🗄️ SQL
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    endpoint = _endpoint()
+    sql_statement_duration.observe(elapsed, endpoint)
+    if endpoint != "-":
+        g.metrics_sql_count = getattr(g, "metrics_sql_count", 0) + 1
+        g.metrics_sql_time = getattr(g, "metrics_sql_time", 0.0) + elapsed
+
+
+def instrument_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# 🌐 Requests
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    g.metrics_sql_count = 0
+    g.metrics_sql_time = 0.0
+
+
+def _finish_request(response):
+    start = getattr(g, "metrics_start", None)
+    if start is None:
+        return response
+    g.metrics_start = None
+
+    endpoint = g.metrics_endpoint
+    elapsed = time.perf_counter() - start
+    sql_count, sql_time = g.metrics_sql_count, g.metrics_sql_time
+    http_request_duration.observe(elapsed, endpoint, request.method, response.status_code)
+    sql_statements_per_request.observe(sql_count, endpoint)
+
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={sql_time * 1000:.1f};desc="{sql_count} queries", app;dur={elapsed * 1000:.1f}',
+    )
+    threshold = current_app.config.get("METRICS_SQL_WARN_THRESHOLD", 0)
+    if threshold and sql_count > threshold:
+        log_event(logger, "request.many_queries", level=logging.WARNING,
+                  endpoint=endpoint, method=request.method, sql_count=sql_count,
+                  sql_ms=round(sql_time * 1000, 1))
+    return response
+
+
+def _teardown_request(exc):
+    # Excepciones no manejadas: after_request no corre
+    start = getattr(g, "metrics_start", None)
+    if start is not None and exc is not None:
+        g.metrics_start = None
+        http_request_duration.observe(time.perf_counter() - start, g.metrics_endpoint, request.method, 500)
+        sql_statements_per_request.observe(g.metrics_sql_count, g.metrics_endpoint)
+
+
+def metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        # Sin token solo se expone a propósito (METRICS_PUBLIC) o en local
+        if not (current_app.config.get("METRICS_PUBLIC") or current_app.debug or current_app.testing):
+            return current_app.response_class("not found\n", status=404, mimetype="text/plain")
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return current_app.response_class("unauthorized\n", status=401, mimetype="text/plain")
+    return current_app.response_class(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app, *engines):
+    """Registra los hooks de request, los eventos de los engines y GET /metrics"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    for engine in engines:
+        instrument_engine(engine)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
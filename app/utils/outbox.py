@@ -0,0 +1,121 @@
+# app/utils/outbox.py
+"""
+Outbox transaccional para borrar imágenes en Cloudinary.
+
+Las rutas solo insertan una fila en asset_deletions dentro de su propia
+transacción (si el commit falla, no queda nada pendiente; si Cloudinary
+falla, el borrado del post igual se confirma). Un worker aparte
+(`flask outbox-worker`) vacía la tabla en lotes con la API de borrado
+masivo y reintenta con backoff exponencial.
+"""
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from app.extensions import db
+from app.models.assetDeletion import AssetDeletion
+from app.models.mediaAsset import MediaAsset
+from app.utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100           # máximo que acepta delete_resources por llamada
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 6 * 3600
+
+# Resultados de Cloudinary que cuentan como borrado exitoso
+DONE_STATUSES = {"deleted", "not_found"}
+
+
+def enqueue_asset_deletion(public_id):
+    """Agenda el borrado; no hace commit (va en la transacción del llamador)"""
+    if public_id:
+        db.session.add(AssetDeletion(public_id=public_id))
+
+
+def cancel_asset_deletions(public_ids):
+    """Las imágenes se vuelven a usar antes de borrarse: saca sus borrados pendientes"""
+    if public_ids:
+        db.session.execute(delete(AssetDeletion).where(AssetDeletion.public_id.in_(list(public_ids))))
+
+
+def backoff_delay(attempts):
+    """Segundos hasta el próximo intento: exponencial con tope y jitter"""
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def drain_asset_outbox(client, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, now=None):
+    """
+    Procesa un lote de borrados vencidos. Devuelve (borrados, fallidos).
+    En Postgres las filas se toman con SKIP LOCKED, así varios workers
+    pueden correr a la vez sin pisarse.
+    """
+    now = now or datetime.utcnow()
+    batch = (
+        AssetDeletion.query
+        .filter(AssetDeletion.next_attempt_at <= now, AssetDeletion.attempts < max_attempts)
+        .order_by(AssetDeletion.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not batch:
+        db.session.commit()
+        return 0, 0
+
+    public_ids = sorted({row.public_id for row in batch})
+    try:
+        result = client.delete_resources(public_ids)
+        statuses = result.get("deleted", {})
+        error = None
+    except Exception as e:
+        statuses = {}
+        error = str(e)
+
+    done = failed = 0
+    destroyed = set()
+    for row in batch:
+        status = statuses.get(row.public_id)
+        if status in DONE_STATUSES:
+            db.session.delete(row)
+            done += 1
+            destroyed.add(row.public_id)
+        else:
+            row.attempts += 1
+            row.last_error = error or f"estado: {status}"
+            row.next_attempt_at = now + timedelta(seconds=backoff_delay(row.attempts))
+            failed += 1
+    if destroyed:
+        # Recién ahora se va la fila de la imagen (hasta acá un post podía retomarla)
+        db.session.execute(
+            delete(MediaAsset).where(MediaAsset.public_id.in_(destroyed), MediaAsset.ref_count == 0)
+        )
+    db.session.commit()
+
+    log_event(logger, "outbox.batch", deleted=done, failed=failed, error=error)
+    return done, failed
+
+
+def run_outbox_worker(client, interval=5.0, batch_size=BATCH_SIZE, stop=None):
+    """
+    Loop del worker (requiere app context). Vacía lotes mientras haya
+    trabajo y duerme `interval` segundos cuando la cola está vacía.
+    `stop` es opcional: un threading.Event para cortar el loop.
+    """
+    while stop is None or not stop.is_set():
+        try:
+            done, failed = drain_asset_outbox(client, batch_size=batch_size)
+        except Exception:
+            db.session.rollback()
+            logger.exception("outbox.drain_failed")
+            done = failed = 0
+        if done + failed < batch_size:
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
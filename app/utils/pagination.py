@@ -0,0 +1,78 @@
+# app/utils/pagination.py
+"""
+Paginación por cursor (keyset) para los listados de posts.
+
+En lugar de OFFSET + COUNT(*), cada página busca a partir de la última
+fila vista sobre (created_at, id), apoyándose en los índices compuestos
+de la tabla posts. El cursor que recibe el cliente es opaco.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no se pudo decodificar."""
+
+
+def encode_cursor(values):
+    """Serializa una lista de valores (str, int, float, datetime) en un token opaco"""
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Inversa de encode_cursor; lanza InvalidCursor si el token no es válido"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list):
+            raise InvalidCursor("cursor inválido")
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v else v
+            for v in payload
+        ]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("cursor inválido") from e
+
+
+def encode_post_cursor(post):
+    return encode_cursor([post.created_at, post.id])
+
+
+def decode_post_cursor(token):
+    """Devuelve (created_at, id) a partir del cursor de un post"""
+    values = decode_cursor(token)
+    if len(values) != 2 or not isinstance(values[0], datetime) or not isinstance(values[1], int):
+        raise InvalidCursor("cursor inválido")
+    return values[0], values[1]
+
+
+def keyset_page(query, model, after, per_page):
+    """
+    Aplica el seek sobre (created_at, id) descendente y devuelve
+    (items, next_cursor). Se pide una fila de más para saber si hay
+    página siguiente sin contar la tabla.
+    """
+    if after:
+        created_at, last_id = decode_post_cursor(after)
+        # Comparación de filas: Postgres la usa como cota del rango del
+        # índice (created_at, id); el OR equivalente no
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = encode_post_cursor(items[-1]) if len(rows) > per_page else None
+    return items, next_cursor
+
+
+def wants_total(args):
+    """El COUNT(*) es opcional en modo cursor: ?include_total=1"""
+    return args.get("include_total", "").lower() in ("1", "true", "yes")
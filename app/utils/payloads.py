@@ -0,0 +1,92 @@
+# app/utils/payloads.py
+"""
+Payloads JSON pre-serializados de cada post.
+
+Al escribir un post (cualquier flush que lo cree o lo modifique, o que
+modifique su cuerpo) se generan una sola vez:
+- posts.summary_json: la fila de los listados (Post.to_summary_dict)
+- post_bodies.detail_json: el detalle público (Post.to_detail_dict)
+
+Las rutas devuelven esos bytes tal cual; los listados concatenan los
+fragmentos de resumen sin decodificarlos (ver json_list_payload).
+"""
+import json
+
+from sqlalchemy import bindparam, event, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.extensions import db
+from app.models.post import Post, PostBody
+
+
+def encode_payload(obj):
+    """JSON compacto y estable (mismo formato para todos los fragmentos)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def write_payloads(connection, posts):
+    """Regenera y guarda los payloads de `posts` (ya flusheados): un UPDATE por tabla"""
+    posts_table, bodies_table = Post.__table__, PostBody.__table__
+    summaries = [(post, encode_payload(post.to_summary_dict())) for post in posts]
+    details = [(post, encode_payload(post.to_detail_dict())) for post in posts if post.body is not None]
+
+    # updated_at = updated_at: que el onupdate de la columna no la toque
+    connection.execute(
+        update(posts_table).where(posts_table.c.id == bindparam("b_id"))
+        .values(summary_json=bindparam("b_summary"), updated_at=posts_table.c.updated_at),
+        [{"b_id": post.id, "b_summary": summary} for post, summary in summaries],
+    )
+    for post, summary in summaries:
+        set_committed_value(post, "summary_json", summary)
+
+    if details:
+        connection.execute(
+            update(bodies_table).where(bodies_table.c.post_id == bindparam("b_post_id"))
+            .values(detail_json=bindparam("b_detail")),
+            [{"b_post_id": post.id, "b_detail": detail} for post, detail in details],
+        )
+        for post, detail in details:
+            set_committed_value(post.body, "detail_json", detail)
+
+
+def json_list_payload(fragments, key="posts", **meta):
+    """'{"posts":[<fragmento>,...],<meta>}' sin volver a serializar los fragmentos"""
+    tail = encode_payload(meta)[1:] if meta else "}"
+    return f'{{"{key}":[' + ",".join(fragments) + "]" + ("," + tail if meta else tail)
+
+
+def extend_fragment(fragment, **fields):
+    """Agrega campos a un objeto JSON ya serializado (p. ej. rank y snippet)"""
+    return fragment[:-1] + "," + encode_payload(fields)[1:]
+
+
+def summary_fragment(post):
+    return post.summary_json or encode_payload(post.to_summary_dict())
+
+
+# 🔄 Regeneración en cada flush
+
+def _collect_posts(session, flush_context, instances):
+    pending = session.info.setdefault("payload_posts", set())
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Post):
+            post = obj
+        elif isinstance(obj, PostBody):
+            post = obj.post
+        else:
+            continue
+        if post is not None and (obj in session.new or session.is_modified(obj)):
+            pending.add(post)
+
+
+def _write_pending(session, flush_context):
+    pending = session.info.pop("payload_posts", set())
+    posts = [p for p in pending if p.id is not None and p not in session.deleted]
+    if posts:
+        write_payloads(session.connection(bind_arguments={"mapper": Post}), posts)
+
+
+def register_payload_listeners():
+    if not event.contains(db.session, "before_flush", _collect_posts):
+        event.listen(db.session, "before_flush", _collect_posts)
+        event.listen(db.session, "after_flush", _write_pending)
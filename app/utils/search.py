@@ -0,0 +1,236 @@
+# app/utils/search.py
+"""
+Búsqueda de texto completo sobre posts.
+
+- Postgres: columna posts.search_vector (tsvector con pesos A/B/C para
+  título / descripción+keywords / cuerpo) con índice GIN. Se ranquea con
+  ts_rank_cd y el snippet sale de ts_headline.
+- SQLite (local): tabla virtual FTS5 posts_fts con rowid = posts.id,
+  ranqueada con bm25 y snippet().
+
+El índice se mantiene solo: un listener after_flush reindexa los posts
+creados o editados (incluido el texto extraído de content_blocks) y
+saca del índice los borrados, dentro de la misma transacción. Los posts
+que ya existían se indexan con backfill_search_index (misma extracción).
+
+Los resultados se paginan por cursor sobre (rank, id).
+"""
+import re
+
+from flask import current_app
+from sqlalchemy import Float, and_, cast, event, func, inspect, or_, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from app.extensions import db
+from app.models.post import Post, PostBody
+from app.utils.content import extract_text
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+# Campos del post que alimentan el índice
+INDEXED_FIELDS = ("title", "description", "keywords")
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+
+def _text_config():
+    return current_app.config.get("SEARCH_TEXT_CONFIG", "spanish")
+
+
+class PostgresSearch:
+    def prepare(self, connection):
+        pass
+
+    def index(self, connection, docs):
+        # Un solo UPDATE con executemany para todo el lote
+        cfg = _text_config()
+        connection.execute(
+            text(
+                "UPDATE posts SET search_vector = "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), :title), 'A') || "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), :description), 'B') || "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), :keywords), 'B') || "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), :body), 'C') "
+                "WHERE id = :id"
+            ),
+            [dict(doc, cfg=cfg) for doc in docs],
+        )
+
+    def remove(self, connection, post_ids):
+        # La fila (y su tsvector) se va con el post
+        pass
+
+    def search(self, q, after, per_page):
+        cfg = cast(_text_config(), REGCONFIG)
+        tsquery = func.websearch_to_tsquery(cfg, q)
+        # ts_rank_cd devuelve real (float4); el cursor guarda un float de Python
+        # (float8): sin el cast el empate rank == last_rank nunca coincide
+        rank = cast(func.ts_rank_cd(Post.search_vector, tsquery), Float(53))
+        snippet = func.ts_headline(
+            cfg, Post.description, tsquery,
+            f"StartSel={HIGHLIGHT_START},StopSel={HIGHLIGHT_STOP},MaxWords=35,MinWords=15"
+        )
+        ranked = (
+            select(Post.id.label("id"), rank.label("rank"), snippet.label("snippet"))
+            .where(Post.search_vector.op("@@")(tsquery))
+            .subquery()
+        )
+        stmt = select(ranked.c.id, ranked.c.rank, ranked.c.snippet)
+        return _keyset(stmt, ranked.c.rank, ranked.c.id, after, per_page)
+
+
+class SQLiteSearch:
+    TABLE = "posts_fts"
+
+    def prepare(self, connection):
+        self.ensure_table(connection)
+
+    def ensure_table(self, connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.TABLE}
+        ).first()
+        if exists:
+            return
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE {self.TABLE} USING fts5("
+            "title, description, keywords, body, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        # Tabla nueva: se indexan los posts que ya existían
+        backfill_search_index(connection, backend=self)
+
+    def index(self, connection, docs):
+        connection.execute(text(f"DELETE FROM {self.TABLE} WHERE rowid = :id"), [{"id": d["id"]} for d in docs])
+        connection.execute(
+            text(f"INSERT INTO {self.TABLE} (rowid, title, description, keywords, body) "
+                 "VALUES (:id, :title, :description, :keywords, :body)"),
+            docs,
+        )
+
+    def remove(self, connection, post_ids):
+        connection.execute(text(f"DELETE FROM {self.TABLE} WHERE rowid = :id"), [{"id": i} for i in post_ids])
+
+    def search(self, q, after, per_page):
+        # Transacción propia: la del request de lectura se descarta al final
+        with db.session.get_bind(mapper=Post).begin() as connection:
+            self.ensure_table(connection)
+        terms = re.findall(r"\w+", q, flags=re.UNICODE)
+        if not terms:
+            return [], None
+        match = " ".join(f'"{t}"' for t in terms)
+        # bm25 devuelve valores más chicos para mejores resultados: se invierte
+        ranked = text(
+            f"SELECT rowid AS id, -bm25({self.TABLE}, 10.0, 5.0, 5.0, 1.0) AS rank, "
+            f"snippet({self.TABLE}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 16) AS snippet "
+            f"FROM {self.TABLE} WHERE {self.TABLE} MATCH :match"
+        ).bindparams(match=match).columns(id=db.Integer, rank=db.Float, snippet=db.String).subquery()
+        stmt = select(ranked.c.id, ranked.c.rank, ranked.c.snippet)
+        return _keyset(stmt, ranked.c.rank, ranked.c.id, after, per_page)
+
+
+def _keyset(stmt, rank_col, id_col, after, per_page):
+    """Pagina (id, rank, snippet) por (rank desc, id desc); devuelve (filas, next_cursor)"""
+    if after:
+        values = decode_cursor(after)
+        if len(values) != 2 or not isinstance(values[1], int) or not isinstance(values[0], (int, float)):
+            raise InvalidCursor("cursor inválido")
+        last_rank, last_id = values
+        stmt = stmt.where(or_(rank_col < last_rank, and_(rank_col == last_rank, id_col < last_id)))
+
+    rows = db.session.execute(
+        stmt.order_by(rank_col.desc(), id_col.desc()).limit(per_page + 1)
+    ).all()
+    items = rows[:per_page]
+    next_cursor = encode_cursor([items[-1].rank, items[-1].id]) if len(rows) > per_page else None
+    return items, next_cursor
+
+
+def get_search_backend(dialect_name=None):
+    dialect_name = dialect_name or db.session.get_bind(mapper=Post).dialect.name
+    if dialect_name == "postgresql":
+        return PostgresSearch()
+    if dialect_name == "sqlite":
+        return SQLiteSearch()
+    raise NotImplementedError(f"búsqueda no soportada para el dialecto '{dialect_name}'")
+
+
+def _document(post_id, title, description, keywords, content_blocks):
+    """Fila a indexar: mismos campos y misma extracción del cuerpo en todos lados"""
+    return {"id": post_id, "title": title or "", "description": description or "",
+            "keywords": keywords or "", "body": extract_text(content_blocks)}
+
+
+def backfill_search_index(connection, batch_size=500, backend=None):
+    """
+    Indexa todos los posts por lotes de `batch_size` (por id) con la misma
+    extracción que el listener. Lo usan la migración de search_vector, la
+    creación de posts_fts y `flask reindex-search`. Devuelve la cantidad.
+    """
+    backend = backend or get_search_backend(connection.dialect.name)
+    posts, bodies = Post.__table__, PostBody.__table__
+    last_id, total = 0, 0
+    while True:
+        rows = connection.execute(
+            select(posts.c.id, posts.c.title, posts.c.description, posts.c.keywords, bodies.c.content_blocks)
+            .select_from(posts.outerjoin(bodies, bodies.c.post_id == posts.c.id))
+            .where(posts.c.id > last_id).order_by(posts.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        backend.index(connection, [_document(*row) for row in rows])
+        last_id = rows[-1].id
+        total += len(rows)
+
+
+def search_posts(q, after=None, per_page=12):
+    """Devuelve ([(post, rank, snippet)], next_cursor); los posts traen summary_json"""
+    rows, next_cursor = get_search_backend().search(q, after, per_page)
+    posts = {p.id: p for p in Post.summary_query().filter(Post.id.in_([r.id for r in rows])).all()}
+    return [(posts[r.id], r.rank, r.snippet) for r in rows if r.id in posts], next_cursor
+
+
+# 🔄 Mantenimiento del índice en cada flush
+
+def _needs_reindex(obj, is_new):
+    if is_new:
+        return True
+    state = inspect(obj)
+    if isinstance(obj, PostBody):
+        return state.attrs.content_blocks.history.has_changes()
+    return any(state.attrs[f].history.has_changes() for f in INDEXED_FIELDS)
+
+
+def _collect_changes(session, flush_context, instances):
+    pending = session.info.setdefault("search_reindex", set())
+    removed = session.info.setdefault("search_remove", set())
+    for obj in list(session.new) + list(session.dirty):
+        post = obj if isinstance(obj, Post) else getattr(obj, "post", None) if isinstance(obj, PostBody) else None
+        if post is not None and _needs_reindex(obj, obj in session.new):
+            pending.add(post)
+    for obj in session.deleted:
+        if isinstance(obj, Post) and obj.id is not None:
+            removed.add(obj.id)
+
+
+def _apply_changes(session, flush_context):
+    pending = session.info.pop("search_reindex", set())
+    removed = session.info.pop("search_remove", set())
+    if not pending and not removed:
+        return
+
+    connection = session.connection(bind_arguments={"mapper": Post})
+    backend = get_search_backend(connection.dialect.name)
+    backend.prepare(connection)
+    if removed:
+        backend.remove(connection, removed)
+    docs = [
+        _document(post.id, post.title, post.description, post.keywords, post.content_blocks)
+        for post in pending if post.id is not None and post not in session.deleted
+    ]
+    if docs:
+        backend.index(connection, docs)
+
+
+def register_search_listeners():
+    if not event.contains(db.session, "before_flush", _collect_changes):
+        event.listen(db.session, "before_flush", _collect_changes)
+        event.listen(db.session, "after_flush", _apply_changes)
@@ -0,0 +1,140 @@
+# app/utils/slugs.py
+"""
+Asignación de slugs únicos.
+
+Si el slug base está libre se usa tal cual (una consulta). Si no, el
+sufijo sale de slug_reservations con un único UPSERT ... RETURNING
+atómico, así dos creates concurrentes nunca eligen el mismo sufijo y el
+costo no crece con la cantidad de duplicados. save_with_unique_slug
+escribe el slug dentro de un savepoint y reintenta si igual hubo
+conflicto en el índice único (p. ej. dos posts nuevos con el mismo base).
+
+Para cargas masivas, allocate_unique_slugs resuelve un lote entero con
+una consulta de slugs tomados y un UPSERT por slug base repetido.
+
+Los slugs que chocan con rutas de /posts/<identifier> (RESERVED_SLUGS) o
+que son solo dígitos (se leerían como id) nunca se asignan tal cual:
+reciben sufijo como si estuvieran tomados.
+"""
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.post import Post
+from app.models.slugReservation import SlugReservation
+from app.utils.sql import upsert
+
+SLUG_ATTEMPTS = 3  # reintentos ante conflicto en el insert
+
+# Rutas fijas bajo /posts/ que taparían a un post con ese slug
+RESERVED_SLUGS = frozenset({"search", "facets", "export", "bulk", "my-posts"})
+
+
+def is_reserved_slug(slug):
+    return slug in RESERVED_SLUGS or slug.isdigit()
+
+
+def reserve_slug_suffix(base_slug):
+    """Reserva y devuelve el siguiente sufijo para base_slug en una sola sentencia"""
+    return reserve_slug_suffixes(base_slug, 1)[0]
+
+
+def reserve_slug_suffixes(base_slug, count):
+    """Reserva `count` sufijos consecutivos para base_slug; devuelve la lista"""
+    stmt = upsert(SlugReservation).values(base_slug=base_slug, last_suffix=count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SlugReservation.base_slug],
+        set_={"last_suffix": SlugReservation.last_suffix + count},
+    ).returning(SlugReservation.last_suffix)
+    last = db.session.execute(stmt).scalar_one()
+    return list(range(last - count + 1, last + 1))
+
+
+def slug_is_taken(slug):
+    return db.session.query(Post.id).filter_by(slug=slug).first() is not None
+
+
+def taken_slugs(slugs):
+    """Subconjunto de `slugs` que ya usa algún post (una sola consulta)"""
+    slugs = set(slugs)
+    if not slugs:
+        return set()
+    return {s for (s,) in db.session.query(Post.slug).filter(Post.slug.in_(slugs))}
+
+
+def generate_unique_slug(title, user_id):
+    """Genera un slug único sin recorrer las colisiones una por una"""
+    from slugify import slugify  # diferido: arranque más rápido
+
+    base_slug = slugify(title) or "post"
+    if not is_reserved_slug(base_slug) and not slug_is_taken(base_slug):
+        return base_slug
+
+    while True:
+        slug = f"{base_slug}-{reserve_slug_suffix(base_slug)}-{user_id}"
+        # Solo puede estar tomado por slugs anteriores a las reservas
+        if not slug_is_taken(slug):
+            return slug
+
+
+def save_with_unique_slug(post, title, user_id, attempts=SLUG_ATTEMPTS):
+    """
+    Asigna un slug libre a `post` y lo escribe dentro de un savepoint.
+    Si el insert/update choca con el índice único, reintenta con un slug
+    nuevo. No hace commit: eso queda a cargo del llamador.
+    """
+    for attempt in range(attempts):
+        slug = generate_unique_slug(title, user_id)
+        try:
+            with db.session.begin_nested():
+                post.slug = slug
+                db.session.add(post)
+            return slug
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+
+
+def allocate_unique_slugs(items, preferred=None):
+    """
+    Asigna slugs a un lote. `items` es una lista de (title, user_id);
+    devuelve la lista de slugs en el mismo orden. `preferred` (opcional,
+    misma longitud) trae slugs a conservar tal cual si están libres y bien
+    formados (slugify(s) == s), p. ej. al importar. Si no, el base se usa si está libre y no se repite en el
+    lote; el resto recibe sufijos reservados de a muchos por base. No
+    escribe los posts.
+    """
+    from slugify import slugify
+
+    bases = [slugify(title) or "post" for title, _ in items]
+    # Un slug preferido (p. ej. del archivo importado) solo vale si ya es un
+    # slug bien formado: "a/b" o "../x" no se alcanzan por /posts/<identifier>
+    # y se saldrían del directorio en export-static
+    preferred = [p if p and slugify(p) == p else None for p in (preferred or [None] * len(items))]
+    slugs = [None] * len(items)
+    taken = taken_slugs([p for p in preferred if p] + bases)
+
+    pending = {}  # base -> posiciones que necesitan sufijo
+    for i, base in enumerate(bases):
+        for candidate in (preferred[i], base):
+            if candidate and candidate not in taken and not is_reserved_slug(candidate):
+                slugs[i] = candidate
+                taken.add(candidate)
+                break
+        else:
+            pending.setdefault(base, []).append(i)
+
+    while pending:
+        candidates = {}
+        for base, positions in pending.items():
+            suffixes = reserve_slug_suffixes(base, len(positions))
+            for i, suffix in zip(positions, suffixes):
+                candidates[i] = f"{base}-{suffix}-{items[i][1]}"
+        # Solo pueden chocar con slugs anteriores a las reservas
+        collisions = taken_slugs(candidates.values())
+        pending = {}
+        for i, slug in candidates.items():
+            if slug in collisions:
+                pending.setdefault(bases[i], []).append(i)
+            else:
+                slugs[i] = slug
+    return slugs
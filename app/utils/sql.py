@@ -0,0 +1,33 @@
+# app/utils/sql.py
+"""Helpers SQL que dependen del dialecto (Postgres en producción, SQLite en local)."""
+from sqlalchemy import event
+
+from app.extensions import db
+
+
+def dialect_name(model=None):
+    return db.session.get_bind(mapper=model).dialect.name
+
+
+def upsert(model):
+    """Devuelve un insert() con soporte de ON CONFLICT para el dialecto actual"""
+    name = dialect_name(model)
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"upsert no soportado para el dialecto '{name}'")
+    return insert(model)
+
+
+def enable_sqlite_foreign_keys(engine):
+    """SQLite no aplica FKs (ni ON DELETE CASCADE) salvo que se active por conexión"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
@@ -0,0 +1,90 @@
+# app/utils/startup.py
+"""
+Medición del arranque en frío (lo usa `flask profile-startup`).
+
+Cada corrida es un proceso nuevo de Python que hace lo mismo que un worker
+de producción: importa wsgi (create_app) y atiende un primer request con
+el test client. Se mide, con relojes de pared comparables entre procesos:
+- interpreter: desde que se lanza el proceso hasta que empieza a importar wsgi
+- app: import de wsgi (módulos + create_app)
+- first_request: el primer request
+- total: desde que se lanza el proceso hasta tener la respuesta
+
+Una corrida extra con `python -X importtime` da el tiempo de import de cada
+módulo (propio y acumulado, en microsegundos).
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Raíz del proyecto (donde está wsgi.py)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PROBE = """
+import json, sys, time
+started = time.time()
+from wsgi import app
+app_ready = time.time()
+response = app.test_client().get(sys.argv[1])
+done = time.time()
+print(json.dumps({"started": started, "app_ready": app_ready, "done": done, "status": response.status_code}))
+"""
+
+
+def _run_probe(path, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _PROBE, path]
+    launched = time.time()
+    proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"el proceso de prueba falló:\n{proc.stderr[-2000:]}")
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    timing = {
+        "interpreter": probe["started"] - launched,
+        "app": probe["app_ready"] - probe["started"],
+        "first_request": probe["done"] - probe["app_ready"],
+        "total": probe["done"] - launched,
+        "status": probe["status"],
+    }
+    return timing, proc.stderr
+
+
+def parse_importtime(output):
+    """
+    Líneas de `-X importtime` -> [{"module", "self_us", "cumulative_us", "depth"}]
+    en el orden en que terminaron de importarse.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue
+    return modules
+
+
+def profile_startup(path="/posts/", runs=3):
+    """{"timings": {medianas en segundos}, "runs": [...], "modules": [...]}"""
+    samples = [_run_probe(path)[0] for _ in range(runs)]
+    timings = {
+        key: statistics.median(s[key] for s in samples)
+        for key in ("interpreter", "app", "first_request", "total")
+    }
+    timings["status"] = samples[-1]["status"]
+    _, stderr = _run_probe(path, importtime=True)
+    return {"timings": timings, "runs": samples, "modules": parse_importtime(stderr)}
+
+
+def top_modules(modules, count=20, key="cumulative_us", package_prefix=None):
+    selected = [m for m in modules if package_prefix is None or m["module"].startswith(package_prefix)]
+    return sorted(selected, key=lambda m: m[key], reverse=True)[:count]
@@ -0,0 +1,169 @@
+# app/utils/static_export.py
+"""
+Snapshot estático de los posts para servir desde un CDN / servidor estático.
+
+Estructura de salida:
+    posts/<id>.json, posts/<slug>.json   detalle (los mismos bytes que GET /posts/<x>)
+    index/page-<n>.json                  listado paginado (como GET /posts/)
+    manifest.json                        {id: {slug, updated}} de lo ya escrito
+
+Es incremental: solo reescribe los posts cuyo updated_at (o created_at)
+cambió desde la corrida anterior, borra los archivos de posts eliminados y
+de slugs viejos, y solo toca las páginas del índice cuyo contenido cambió.
+El manifest se guarda cada pocos posts, así una corrida interrumpida
+retoma donde quedó. Todas las escrituras son atómicas (tmp + rename).
+"""
+import json
+import os
+import tempfile
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, load_only, undefer
+
+from app.extensions import db
+from app.models.post import Post, PostBody
+from app.utils.payloads import encode_payload, json_list_payload, summary_fragment
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+CHECKPOINT_EVERY = 200   # posts escritos entre guardados del manifest
+CHUNK_SIZE = 500
+
+
+def _write_atomic(path, data):
+    """Escribe bytes en `path` vía archivo temporal + rename; False si no cambió"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("posts", {})
+
+
+def save_manifest(out_dir, posts):
+    data = json.dumps({"version": MANIFEST_VERSION, "posts": posts}, sort_keys=True).encode()
+    _write_atomic(os.path.join(out_dir, MANIFEST_NAME), data)
+
+
+def _stamp(post):
+    return (post.updated_at or post.created_at).isoformat()
+
+
+def _stamps():
+    """{id: (slug, stamp)} de todos los posts, leyendo solo esas columnas"""
+    rows = db.session.execute(select(Post.id, Post.slug, Post.updated_at, Post.created_at))
+    return {str(r.id): (r.slug, (r.updated_at or r.created_at).isoformat()) for r in rows}
+
+
+def detail_payload(post):
+    return post.body.detail_json if post.body is not None and post.body.detail_json \
+        else encode_payload(post.to_detail_dict())
+
+
+def export_posts(out_dir, manifest, full=False):
+    """Escribe el detalle de los posts nuevos o cambiados; devuelve (escritos, borrados)"""
+    posts_dir = os.path.join(out_dir, "posts")
+    current = _stamps()
+    written = removed = 0
+
+    # 🗑️ Posts borrados y slugs viejos
+    for post_id, entry in list(manifest.items()):
+        slug, _ = current.get(post_id, (None, None))
+        if slug != entry["slug"]:
+            _remove(os.path.join(posts_dir, f"{entry['slug']}.json"))
+        if post_id not in current:
+            _remove(os.path.join(posts_dir, f"{post_id}.json"))
+            del manifest[post_id]
+            removed += 1
+
+    stale = [int(post_id) for post_id, (slug, stamp) in current.items()
+             if full or manifest.get(post_id) != {"slug": slug, "updated": stamp}]
+    stale.sort()
+
+    # ✍️ Detalle de los posts cambiados, por tandas con su cuerpo unido
+    for start in range(0, len(stale), CHUNK_SIZE):
+        ids = stale[start:start + CHUNK_SIZE]
+        posts = db.session.scalars(
+            select(Post).options(joinedload(Post.body).options(undefer(PostBody.detail_json))).where(Post.id.in_(ids)).order_by(Post.id)
+        ).unique().all()
+        for post in posts:
+            payload = detail_payload(post).encode()
+            _write_atomic(os.path.join(posts_dir, f"{post.id}.json"), payload)
+            _write_atomic(os.path.join(posts_dir, f"{post.slug}.json"), payload)
+            manifest[str(post.id)] = {"slug": post.slug, "updated": _stamp(post)}
+            written += 1
+            if written % CHECKPOINT_EVERY == 0:
+                save_manifest(out_dir, manifest)
+        db.session.expunge_all()
+
+    save_manifest(out_dir, manifest)
+    return written, removed
+
+
+def export_index(out_dir, per_page=12):
+    """Reescribe las páginas del índice que cambiaron; devuelve cuántas se escribieron"""
+    index_dir = os.path.join(out_dir, "index")
+    total = db.session.query(Post.id).count()
+    pages = max((total + per_page - 1) // per_page, 1)
+
+    query = (
+        select(Post)
+        .options(load_only(Post.id, Post.created_at, Post.summary_json))
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .execution_options(yield_per=per_page)
+    )
+    result = db.session.execute(query).scalars()
+
+    written = 0
+    for page in range(1, pages + 1):
+        items = result.fetchmany(per_page)
+        payload = json_list_payload(
+            [summary_fragment(p) for p in items],
+            total=total, page=page, pages=pages, per_page=per_page
+        ).encode()
+        written += _write_atomic(os.path.join(index_dir, f"page-{page}.json"), payload)
+    result.close()
+
+    # Páginas que sobran de una corrida anterior con más posts
+    page = pages + 1
+    while _remove(os.path.join(index_dir, f"page-{page}.json")):
+        page += 1
+    return written
+
+
+def export_static(out_dir, per_page=12, full=False):
+    """Genera / actualiza el snapshot en out_dir. Devuelve un resumen"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {} if full else load_manifest(out_dir)
+    written, removed = export_posts(out_dir, manifest, full=full)
+    pages = export_index(out_dir, per_page=per_page)
+    return {"posts_written": written, "posts_removed": removed, "index_pages_written": pages}
@@ -0,0 +1,150 @@
+# app/utils/transfer.py
+"""
+Export / import de posts en NDJSON (un post por línea).
+
+- Export: un solo SELECT con el cuerpo unido y yield_per, así el driver
+  usa un cursor del lado del servidor y la memoria no crece con la
+  cantidad de posts. Lo usan GET /posts/export y `flask export-posts`.
+- Import: lee líneas en lotes, resuelve los slugs de todo el lote de una
+  vez (se conserva el slug original si está libre) e inserta cada lote con
+  un flush. Las líneas inválidas se reportan y se saltean. Cada post
+  importado suma al contador semanal de su created_at (sin límite).
+"""
+import json
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models.post import Post, normalize_category
+from app.utils.media_assets import acquire_post_assets
+from app.utils.membership_rules import add_weekly_posts
+from app.utils.slugs import allocate_unique_slugs
+
+EXPORT_CHUNK_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+
+# Campos del registro exportado, además de content_blocks y timestamps
+# (las métricas derivadas se recalculan al importar)
+EXPORT_FIELDS = (
+    "id", "slug", "title", "description", "keywords", "category", "featured_image",
+    "featured_image_public_id", "company_id", "user_id", "user_name", "week_number",
+)
+REQUIRED_FIELDS = ("title", "description", "user_id", "user_name")
+
+
+def export_query(user_id=None, company_id=None, category=None, since=None, until=None):
+    stmt = select(Post).options(joinedload(Post.body)).order_by(Post.id)
+    if user_id is not None:
+        stmt = stmt.where(Post.user_id == user_id)
+    if company_id is not None:
+        stmt = stmt.where(Post.company_id == company_id)
+    if category:
+        stmt = stmt.where(Post.category_key == normalize_category(category))
+    if since is not None:
+        stmt = stmt.where(Post.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(Post.created_at < until)
+    return stmt
+
+
+def export_record(post):
+    record = {field: getattr(post, field) for field in EXPORT_FIELDS}
+    record["content_blocks"] = post.content_blocks
+    record["created_at"] = post.created_at.isoformat() if post.created_at else None
+    record["updated_at"] = post.updated_at.isoformat() if post.updated_at else None
+    return record
+
+
+def iter_export_lines(chunk_size=EXPORT_CHUNK_SIZE, **filters):
+    """Genera una línea NDJSON (con \\n) por post, en orden de id"""
+    result = db.session.execute(
+        export_query(**filters).execution_options(yield_per=chunk_size)
+    )
+    for post in result.scalars():
+        yield json.dumps(export_record(post), ensure_ascii=False) + "\n"
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _build_post(record):
+    missing = [f for f in REQUIRED_FIELDS if record.get(f) in (None, "")]
+    if missing:
+        raise ValueError(f"Faltan campos obligatorios: {', '.join(missing)}")
+    blocks = record.get("content_blocks") or []
+    if not isinstance(blocks, list):
+        raise ValueError("content_blocks debe ser una lista")
+
+    created_at = _parse_datetime(record.get("created_at")) or datetime.utcnow()
+    return Post(
+        title=record["title"],
+        description=record["description"],
+        keywords=record.get("keywords"),
+        category=record.get("category"),
+        featured_image=record.get("featured_image"),
+        featured_image_public_id=record.get("featured_image_public_id"),
+        company_id=record.get("company_id"),
+        user_id=int(record["user_id"]),
+        user_name=record["user_name"],
+        week_number=record.get("week_number") or created_at.isocalendar()[1],
+        content_blocks=blocks,
+        created_at=created_at,
+        updated_at=_parse_datetime(record.get("updated_at")),
+    )
+
+
+def _import_batch(lines):
+    """Inserta un lote (sin commit). Devuelve (importados, errores)"""
+    posts, titles, preferred, errors = [], [], [], []
+    for line_no, line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("cada línea debe ser un objeto JSON")
+            post = _build_post(record)
+        except (ValueError, TypeError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+            continue
+        posts.append(post)
+        titles.append((post.title, post.user_id))
+        preferred.append(record.get("slug"))
+
+    if not posts:
+        return 0, errors
+
+    for post, slug in zip(posts, allocate_unique_slugs(titles, preferred)):
+        post.slug = slug
+
+    acquire_post_assets(posts)
+    # Cuentan en la semana en que se crearon: el delete les devuelve el cupo
+    add_weekly_posts((post.user_id, post.created_at) for post in posts)
+
+    db.session.add_all(posts)
+    db.session.flush()
+    return len(posts), errors
+
+
+def import_lines(lines, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importa posts desde un iterable de líneas NDJSON y hace commit por
+    lote. Los ids no se conservan. Devuelve {"imported": n, "errors": [...]}.
+    """
+    numbered = ((n, line) for n, line in enumerate(lines, start=1) if line.strip())
+    imported, errors = 0, []
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            break
+        try:
+            count, batch_errors = _import_batch(batch)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        imported += count
+        errors.extend(batch_errors)
+    return {"imported": imported, "errors": errors}
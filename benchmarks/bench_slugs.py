@@ -0,0 +1,58 @@
+# benchmarks/bench_slugs.py
+"""
+Benchmark de asignación de slugs con títulos repetidos.
+
+Crea N posts con el mismo título y reporta latencia media y sentencias SQL
+por asignación en tramos de 100, para verificar que el costo se mantiene
+plano a medida que se acumulan duplicados.
+
+Uso:
+    python benchmarks/bench_slugs.py --posts 2000
+    DATABASE_URL=postgresql://... python benchmarks/bench_slugs.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-with-32-bytes!!")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.utils.slugs import save_with_unique_slug  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--bucket", type=int, default=100)
+    parser.add_argument("--title", default="Mercados emergentes en 2025")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        statements = [0]
+        event.listen(db.engine, "before_cursor_execute", lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+        print(f"{'posts':>8} {'ms/slug':>10} {'sql/slug':>10}")
+        for start in range(0, args.posts, args.bucket):
+            statements[0] = 0
+            t0 = time.perf_counter()
+            for i in range(args.bucket):
+                post = Post(title=args.title, description="bench", user_id=1 + i % 5,
+                            user_name="bench", content_blocks=[])
+                save_with_unique_slug(post, args.title, post.user_id)
+                db.session.commit()
+            elapsed = time.perf_counter() - t0
+            print(f"{start + args.bucket:>8} {elapsed * 1000 / args.bucket:>10.3f} "
+                  f"{statements[0] / args.bucket:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/fakes.py
+"""
+Sustitutos locales de Cloudinary e Infinity para los benchmarks.
+
+Se inyectan con media.init_app(app, client=...) e
+infinity.init_app(app, session=...); `latency` (segundos) simula la red.
+"""
+import itertools
+import threading
+import time
+
+
+class FakeCloudinaryClient:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def upload(self, file, **options):
+        self._wait()
+        with self._lock:
+            n = next(self._ids)
+        public_id = f"{options.get('folder', 'bench')}/fake-{n}"
+        return {"secure_url": f"https://res.example.com/{public_id}.png", "public_id": public_id}
+
+    def destroy(self, public_id):
+        self._wait()
+        return {"result": "ok"}
+
+    def delete_resources(self, public_ids):
+        self._wait()
+        return {"deleted": {public_id: "deleted" for public_id in public_ids}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeInfinitySession:
+    """Responde el login de Infinity: cualquier email con password 'bench' es válido"""
+
+    def __init__(self, latency=0.0, membership_level="platinum"):
+        self.latency = latency
+        self.membership_level = membership_level
+
+    def post(self, url, json=None, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+        if (json or {}).get("password") != "bench":
+            return FakeResponse(401, {"error": "invalid"})
+        email = json["email"]
+        user_id = int(email.split("@")[0].rsplit("-", 1)[-1])
+        return FakeResponse(200, {
+            "user_id": user_id,
+            "membership_level": self.membership_level,
+            "is_admin": False,
+            "is_buyer": True,
+            "is_seller": False,
+        })
+
+    def close(self):
+        pass
@@ -0,0 +1,65 @@
+# benchmarks/load.py
+"""Generador de carga concurrente sobre el test client de Flask y estadísticas."""
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(sorted_values, p):
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def run_load(app, scenario, requests=200, concurrency=1, warmup=10):
+    """
+    Ejecuta `scenario(client, i)` `requests` veces repartidas en
+    `concurrency` hilos (cada uno con su test client). El escenario devuelve
+    la respuesta; >= 400 cuenta como error. Devuelve el resumen.
+    """
+    warm_client = app.test_client()
+    for i in range(warmup):
+        scenario(warm_client, -1 - i)
+
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+    latencies, errors = [], [0]
+    results_lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        local, local_errors = [], 0
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            t0 = time.perf_counter()
+            response = scenario(client, i)
+            local.append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                local_errors += 1
+        with results_lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return summarize(latencies, errors[0], time.perf_counter() - t0)
@@ -0,0 +1,179 @@
+# benchmarks/run.py
+"""
+Benchmark de la API de posts.
+
+Levanta la app contra una base descartable (SQLite en un directorio
+temporal salvo --database-url / BENCH_DATABASE_URL), siembra usuarios y posts, reemplaza
+Cloudinary e Infinity por fakes locales y recorre los escenarios con el
+test client, en hilos concurrentes. Reporta p50/p95/p99 y throughput por
+escenario y los compara con benchmarks/baseline.json: sale con código 1
+si algún escenario empeora más que la tolerancia.
+
+Uso:
+    python -m benchmarks.run
+    python -m benchmarks.run --posts 5000 --requests 500 --concurrency 8
+    python -m benchmarks.run --update-baseline   # guardar los números actuales
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+from types import SimpleNamespace
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SCENARIOS = ("list", "list_cursor", "list_category", "search", "detail", "create", "edit", "upload", "login")
+
+# PNG mínimo: filetype solo mira la firma, el resto se varía para no deduplicar
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="Requests por escenario.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0,
+                        help="Latencia simulada de Cloudinary e Infinity.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Empeoramiento admitido (0.3 = 30%%) en p95 y throughput.")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="Base descartable (por defecto SQLite en un directorio temporal).")
+    return parser.parse_args(argv)
+
+
+def build_app(args):
+    """Importa la app recién después de fijar el entorno (Config lee os.environ al importar)"""
+    # Nunca se toma DATABASE_URL del entorno: el benchmark siembra y escribe datos
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='blog-bench-'), 'bench.db')}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-with-32-bytes!!")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import create_app
+    from app.extensions import db, infinity, media
+    from benchmarks.fakes import FakeCloudinaryClient, FakeInfinitySession
+
+    app = create_app()
+    latency = args.fake_latency_ms / 1000
+    media.init_app(app, client=FakeCloudinaryClient(latency=latency))
+    infinity.init_app(app, session=FakeInfinitySession(latency=latency))
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def build_scenarios(app, owners, args):
+    from app.auth.tokens import issue_access_token
+
+    rng = random.Random(args.seed)
+    post_ids = sorted(owners)
+    users = sorted(set(owners.values()))
+    with app.app_context():
+        tokens = {
+            user_id: issue_access_token(
+                SimpleNamespace(id=user_id, username=f"bench-{user_id}", role="user"), "platinum"
+            )[0]
+            for user_id in users
+        }
+    headers = {user_id: {"Authorization": f"Bearer {token}"} for user_id, token in tokens.items()}
+
+    def as_owner(post_id):
+        return headers[owners[post_id]]
+
+    def new_post(i):
+        return {
+            "title": f"Benchmark post {i}",
+            "description": "Post creado por el benchmark",
+            "category": "Tecnología",
+            "content_blocks": [{"type": "paragraph", "text": "Texto del benchmark " * 20}],
+        }
+
+    return {
+        "list": lambda c, i: c.get("/posts/?page=%d" % (1 + i % 20)),
+        "list_cursor": lambda c, i: c.get("/posts/?after="),
+        "list_category": lambda c, i: c.get("/posts/?category=energía&after="),
+        "search": lambda c, i: c.get("/posts/search?q=" + rng.choice(["cobre", "energía solar", "puerto"])),
+        "detail": lambda c, i: c.get(f"/posts/{rng.choice(post_ids)}"),
+        "create": lambda c, i: c.post("/posts/", json=new_post(i), headers=headers[rng.choice(users)]),
+        "edit": lambda c, i: (lambda pid: c.put(
+            f"/posts/{pid}", json={"description": f"Editado {i}"}, headers=as_owner(pid)
+        ))(rng.choice(post_ids)),
+        "upload": lambda c, i: c.post("/upload-image", data={
+            "image": (io.BytesIO(PNG_HEADER + os.urandom(256)), "bench.png")
+        }, content_type="multipart/form-data"),
+        "login": lambda c, i: c.post("/auth/", json={
+            "email": f"bench-{rng.choice(users)}@example.com", "password": "bench"
+        }),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Devuelve la lista de regresiones contra el baseline"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > {base['p95_ms']} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['rps']} rps < {base['rps']} rps")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} errores")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = build_app(args)
+
+    from benchmarks.load import run_load
+    from benchmarks.seed import seed
+
+    with app.app_context():
+        owners = seed(posts=args.posts, users=args.users, random_seed=args.seed)
+    scenarios = build_scenarios(app, owners, args)
+
+    results = {}
+    for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+        results[name] = run_load(app, scenarios[name], requests=args.requests, concurrency=args.concurrency)
+        if not args.json:
+            r = results[name]
+            print(f"{name:<14} p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  "
+                  f"p99 {r['p99_ms']:>8.2f} ms  {r['rps']:>8.1f} rps  errores {r['errors']}")
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline actualizado: {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("sin baseline; correr con --update-baseline para crearlo", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESIÓN {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# benchmarks/seed.py
+"""Datos de prueba: usuarios y posts con bloques de todos los tipos."""
+import random
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import BlogUser, Post
+from app.utils.slugs import allocate_unique_slugs
+
+CATEGORIES = ["Minería", "Energía", "Agro", "Tecnología", "Finanzas", "Turismo"]
+WORDS = ("mercado cobre litio exportaciones inversión energía solar agro puerto empleo "
+         "inflación crecimiento industria logística innovación región empresa").split()
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_blocks(rng, paragraphs=6):
+    blocks = [{"type": "heading", "level": 2, "text": sentence(rng, 4)}]
+    for i in range(paragraphs):
+        blocks.append({"type": "paragraph", "text": " ".join(sentence(rng, 12) for _ in range(3))})
+        if i == 2:
+            blocks.append({"type": "list", "items": [sentence(rng, 5) for _ in range(3)]})
+        if i == 4:
+            blocks.append({"type": "image", "url": "https://res.example.com/seed.png",
+                           "public_id": f"seed/{rng.randint(1, 50)}", "caption": sentence(rng, 4)})
+    return blocks
+
+
+def seed(posts=1000, users=50, batch_size=500, random_seed=1234):
+    """Crea `users` usuarios y `posts` posts; devuelve {post_id: user_id}"""
+    rng = random.Random(random_seed)
+    db.session.add_all([
+        BlogUser(infinity_id=i, email=f"bench-{i}@example.com", username=f"bench-{i}")
+        for i in range(1, users + 1)
+    ])
+    db.session.commit()
+
+    now = datetime.utcnow()
+    for start in range(0, posts, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, posts)):
+            user_id = 1 + i % users
+            post = Post(
+                title=f"{sentence(rng, 5)[:-1]} {i}",
+                description=sentence(rng, 20),
+                keywords=", ".join(rng.sample(WORDS, 3)),
+                category=rng.choice(CATEGORIES),
+                company_id=rng.randint(1, 20),
+                user_id=user_id,
+                user_name=f"bench-{user_id}",
+                week_number=1,
+                created_at=now - timedelta(minutes=posts - i),
+            )
+            post.content_blocks = make_blocks(rng)
+            batch.append(post)
+        for post, slug in zip(batch, allocate_unique_slugs([(p.title, p.user_id) for p in batch])):
+            post.slug = slug
+        db.session.add_all(batch)
+        db.session.commit()
+
+    return dict(db.session.query(Post.id, Post.user_id).all())
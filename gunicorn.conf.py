@@ -0,0 +1,128 @@
+# gunicorn.conf.py
+"""
+Configuración de gunicorn para producción (Procfile: web).
+
+- preload_app: la app se importa una sola vez en el master y los workers
+  forkeados comparten esa memoria copy-on-write (gc.freeze evita que el GC
+  toque esas páginas). post_fork rehace lo que no sobrevive al fork:
+  conexiones del pool de SQLAlchemy, hilo del logging y sesión de Infinity.
+- Workers gthread: las subidas a Cloudinary y el login de Infinity pasan la
+  mayor parte del tiempo esperando red; con hilos un worker atiende varios
+  requests a la vez.
+- Cantidad de workers según CPUs y memoria disponibles (respeta los
+  límites del contenedor); WEB_CONCURRENCY la fija a mano.
+- max_requests + jitter: cada worker se recicla de forma escalonada y
+  controlada para acotar el crecimiento de memoria.
+
+Variables: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_WORKER_CLASS,
+WEB_MEMORY_PER_WORKER_MB, GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER,
+GUNICORN_TIMEOUT.
+- Hilos por worker: THREADS_PER_CPU hilos por CPU repartidos entre los
+  workers, nunca más que DB_POOL_SIZE + DB_MAX_OVERFLOW (las conexiones
+  que puede abrir cada worker: un hilo de más solo esperaría en
+  pool_timeout). GUNICORN_THREADS los fija a mano.
+"""
+import gc
+import os
+
+# Los requests esperan red (DB, Cloudinary, Infinity) la mayor parte del tiempo
+THREADS_PER_CPU = 4
+
+
+def _cpu_count():
+    """CPUs utilizables: afinidad del proceso y cuota de cgroup v2 (cpu.max)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def _available_memory_mb():
+    """Memoria disponible: límite del cgroup (memory.max) o MemAvailable; None si no se sabe"""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            return int(limit) // (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _workers():
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    workers = 2 * _cpu_count() + 1
+    memory = _available_memory_mb()
+    if memory is not None:
+        per_worker = int(os.getenv("WEB_MEMORY_PER_WORKER_MB", 150))
+        workers = min(workers, memory // per_worker)
+    return max(1, workers)
+
+
+def _threads(workers):
+    if os.getenv("GUNICORN_THREADS"):
+        return max(1, int(os.environ["GUNICORN_THREADS"]))
+    from app.config import Config
+
+    threads = THREADS_PER_CPU * max(1, _cpu_count() // workers)
+    return max(1, min(threads, Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW))
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+preload_app = True
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = _workers()
+# La app lo lee (Config.WEB_CONCURRENCY) para saber que los cachés por proceso no se comparten
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = _threads(workers)
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Heartbeat de los workers en memoria, no en disco
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = None
+errorlog = "-"
+
+
+def when_ready(server):
+    # La app ya está cargada: lo que hay hasta acá no lo revisa el GC en los hijos
+    gc.freeze()
+    server.log.info("workers=%s threads=%s worker_class=%s", workers, threads, worker_class)
+
+
+def post_fork(server, worker):
+    from app.extensions import db, infinity
+    from app.utils.log import start_listener
+    from wsgi import app
+
+    # Las conexiones heredadas del master no se usan en el hijo (close=False:
+    # no cerrar los sockets que siguen siendo del master)
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # El hilo del QueueListener no sobrevive al fork
+    start_listener()
+    # Sesión HTTP y circuito propios de cada worker
+    infinity.reset()
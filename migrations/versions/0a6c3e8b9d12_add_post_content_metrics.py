@@ -0,0 +1,39 @@
+"""Add derived content metrics to posts and post_bodies
+
+Revision ID: 0a6c3e8b9d12
+Revises: f5b81d3c6a47
+Create Date: 2025-11-14 09:12:30.557804
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0a6c3e8b9d12'
+down_revision = 'f5b81d3c6a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reading_time', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=300), nullable=True))
+
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('toc', postgresql.JSON(astext_type=sa.Text()), nullable=False, server_default='[]'))
+        batch_op.add_column(sa.Column('image_refs', postgresql.JSON(astext_type=sa.Text()), nullable=False, server_default='[]'))
+
+    # 📐 Los valores se calculan en Python: correr `flask rebuild-posts`
+    # después de migrar para completar los posts existentes
+
+
+def downgrade():
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.drop_column('image_refs')
+        batch_op.drop_column('toc')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('excerpt')
+        batch_op.drop_column('reading_time')
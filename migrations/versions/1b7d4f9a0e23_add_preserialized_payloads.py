@@ -0,0 +1,35 @@
+"""Add pre-serialized summary/detail payloads
+
+Revision ID: 1b7d4f9a0e23
+Revises: 0a6c3e8b9d12
+Create Date: 2025-11-17 15:48:02.671390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b7d4f9a0e23'
+down_revision = '0a6c3e8b9d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('summary_json', sa.Text(), nullable=True))
+
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('detail_json', sa.Text(), nullable=True))
+
+    # 📨 Se generan en Python: correr `flask rebuild-posts` después de migrar.
+    # Mientras tanto las rutas serializan al vuelo los posts sin payload
+
+
+def downgrade():
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.drop_column('detail_json')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('summary_json')
@@ -0,0 +1,37 @@
+"""Convert post_bodies.content_blocks to JSONB with a GIN index
+
+Revision ID: 2c9e5a1b7f34
+Revises: 1b7d4f9a0e23
+Create Date: 2025-11-19 10:26:54.308117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '2c9e5a1b7f34'
+down_revision = '1b7d4f9a0e23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.alter_column('content_blocks',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=False,
+               postgresql_using='content_blocks::jsonb')
+        batch_op.create_index('ix_post_bodies_content_blocks', ['content_blocks'], unique=False,
+                              postgresql_using='gin', postgresql_ops={'content_blocks': 'jsonb_path_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('post_bodies', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_bodies_content_blocks', postgresql_using='gin')
+        batch_op.alter_column('content_blocks',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               existing_nullable=False,
+               postgresql_using='content_blocks::json')
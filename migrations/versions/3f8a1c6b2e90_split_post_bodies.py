@@ -0,0 +1,50 @@
+"""Split content_blocks into post_bodies
+
+Revision ID: 3f8a1c6b2e90
+Revises: 7c41e9a0d3b2
+Create Date: 2025-10-28 09:41:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3f8a1c6b2e90'
+down_revision = '7c41e9a0d3b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('post_bodies',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('content_blocks', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+
+    # 🚚 Mover los cuerpos existentes antes de quitar la columna
+    op.execute(
+        "INSERT INTO post_bodies (post_id, content_blocks) "
+        "SELECT id, content_blocks FROM posts"
+    )
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('content_blocks')
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_blocks', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+
+    op.execute(
+        "UPDATE posts SET content_blocks = b.content_blocks "
+        "FROM post_bodies b WHERE b.post_id = posts.id"
+    )
+    op.execute("UPDATE posts SET content_blocks = '[]' WHERE content_blocks IS NULL")
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column('content_blocks', nullable=False)
+
+    op.drop_table('post_bodies')
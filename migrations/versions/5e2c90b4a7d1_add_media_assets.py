@@ -0,0 +1,34 @@
+"""Add media_assets
+
+Revision ID: 5e2c90b4a7d1
+Revises: d15b7f3e8a26
+Create Date: 2025-11-03 12:48:30.672419
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2c90b4a7d1'
+down_revision = 'd15b7f3e8a26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_assets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('public_id', sa.String(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('digest'),
+    sa.UniqueConstraint('public_id')
+    )
+
+
+def downgrade():
+    op.drop_table('media_assets')
@@ -0,0 +1,30 @@
+"""Keyset pagination indexes on posts
+
+Revision ID: 7c41e9a0d3b2
+Revises: 5b0d226a4363
+Create Date: 2025-10-27 10:12:04.318552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c41e9a0d3b2'
+down_revision = '5b0d226a4363'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_company_id_created_at_id', ['company_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_user_id_created_at_id')
+        batch_op.drop_index('ix_posts_company_id_created_at_id')
+        batch_op.drop_index('ix_posts_created_at_id')
@@ -0,0 +1,28 @@
+"""Add slug_reservations
+
+Revision ID: a9d2e4f71c08
+Revises: 3f8a1c6b2e90
+Create Date: 2025-10-29 16:05:12.447310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d2e4f71c08'
+down_revision = '3f8a1c6b2e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('slug_reservations',
+    sa.Column('base_slug', sa.String(length=255), nullable=False),
+    sa.Column('last_suffix', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('base_slug')
+    )
+
+
+def downgrade():
+    op.drop_table('slug_reservations')
@@ -0,0 +1,37 @@
+"""Add asset_deletions outbox
+
+Revision ID: c3e8f05a9b14
+Revises: 5e2c90b4a7d1
+Create Date: 2025-11-04 17:30:09.218846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f05a9b14'
+down_revision = '5e2c90b4a7d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('asset_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('public_id', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('asset_deletions', schema=None) as batch_op:
+        batch_op.create_index('ix_asset_deletions_next_attempt_at', ['next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('asset_deletions', schema=None) as batch_op:
+        batch_op.drop_index('ix_asset_deletions_next_attempt_at')
+
+    op.drop_table('asset_deletions')
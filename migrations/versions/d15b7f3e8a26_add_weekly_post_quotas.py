@@ -0,0 +1,40 @@
+"""Add weekly_post_quotas
+
+Revision ID: d15b7f3e8a26
+Revises: a9d2e4f71c08
+Create Date: 2025-10-30 11:22:48.105937
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd15b7f3e8a26'
+down_revision = 'a9d2e4f71c08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('weekly_post_quotas',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('iso_year', sa.Integer(), nullable=False),
+    sa.Column('iso_week', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'iso_year', 'iso_week')
+    )
+
+    # 📊 Cargar los contadores a partir de los posts existentes
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(
+            "INSERT INTO weekly_post_quotas (user_id, iso_year, iso_week, post_count) "
+            "SELECT user_id, CAST(EXTRACT(ISOYEAR FROM created_at) AS INTEGER), "
+            "CAST(EXTRACT(WEEK FROM created_at) AS INTEGER), COUNT(*) "
+            "FROM posts WHERE created_at IS NOT NULL "
+            "GROUP BY 1, 2, 3"
+        )
+
+
+def downgrade():
+    op.drop_table('weekly_post_quotas')
@@ -0,0 +1,37 @@
+"""Add posts.search_vector for full-text search
+
+Revision ID: e47a2c9d1b35
+Revises: 8b6d3a1f4c57
+Create Date: 2025-11-10 16:22:08.415337
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e47a2c9d1b35'
+down_revision = '8b6d3a1f4c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # 🔎 Backfill en Python, por lotes: mismo extract_text (TEXT_KEYS), mismos
+    # pesos y mismo SEARCH_TEXT_CONFIG que el listener de app/utils/search.py.
+    # Con --sql no hay conexión: correr `flask reindex-search` después
+    if not context.is_offline_mode():
+        from app.utils.search import backfill_search_index
+        backfill_search_index(op.get_bind())
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
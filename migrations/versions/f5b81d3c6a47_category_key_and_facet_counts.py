@@ -0,0 +1,58 @@
+"""Add posts.category_key and post_facet_counts
+
+Revision ID: f5b81d3c6a47
+Revises: e47a2c9d1b35
+Create Date: 2025-11-12 11:37:45.120968
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b81d3c6a47'
+down_revision = 'e47a2c9d1b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('category_key', sa.String(length=100), nullable=True))
+
+    # 🔠 La clave sale de normalize_category (strip + casefold) en Python, por
+    # lotes: lower() de la base no coincide con casefold (ß, ﬁ, ...). Con
+    # --sql no hay conexión: correr `flask rebuild-facets` después
+    if not context.is_offline_mode():
+        from app.utils.facets import backfill_category_keys
+        backfill_category_keys(op.get_bind())
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_category_key_created_at_id', ['category_key', 'created_at', 'id'], unique=False)
+
+    op.create_table('post_facet_counts',
+    sa.Column('facet', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('label', sa.String(length=100), nullable=True),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+
+    # 📊 Conteos iniciales; desde acá se mantienen por deltas
+    op.execute(
+        "INSERT INTO post_facet_counts (facet, value, label, post_count) "
+        "SELECT 'category', category_key, min(trim(category)), count(*) FROM posts "
+        "WHERE category_key IS NOT NULL GROUP BY category_key"
+    )
+    op.execute(
+        "INSERT INTO post_facet_counts (facet, value, label, post_count) "
+        "SELECT 'company', CAST(company_id AS VARCHAR), NULL, count(*) FROM posts "
+        "WHERE company_id IS NOT NULL GROUP BY company_id"
+    )
+
+
+def downgrade():
+    op.drop_table('post_facet_counts')
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_category_key_created_at_id')
+        batch_op.drop_column('category_key')
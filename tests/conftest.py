@@ -0,0 +1,69 @@
+# tests/conftest.py
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+# app.config arma la Config al importarse: la base de los tests va antes
+# (SQLite en un directorio temporal, nunca la de DATABASE_URL del entorno)
+_DB_DIR = tempfile.mkdtemp(prefix="blog-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ.pop("POST_CACHE_URL", None)
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-" + "x" * 32)
+os.environ.setdefault("SECRET_KEY", "test")
+
+
+@pytest.fixture
+def app():
+    from sqlalchemy import text
+
+    from app import create_app
+    from app.extensions import db
+    from app.utils.facets import facet_cache
+
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(text("DROP TABLE IF EXISTS posts_fts"))
+        db.session.commit()
+        db.create_all()
+        facet_cache.clear()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(app):
+    """auth(user_id, level) -> headers con un access token válido"""
+    from app.auth.tokens import issue_access_token
+
+    def headers(user_id=1, level="platinum", is_admin=False):
+        user = SimpleNamespace(id=user_id, username=f"user{user_id}", role="user")
+        token, _ = issue_access_token(user, level, is_admin=is_admin)
+        return {"Authorization": f"Bearer {token}"}
+    return headers
+
+
+@pytest.fixture
+def new_post(client, auth):
+    """new_post(title, **campos) -> datos del post creado con POST /posts/"""
+    def create(title, headers=None, **fields):
+        body = {
+            "title": title,
+            "description": fields.pop("description", f"Descripción de {title}"),
+            "category": fields.pop("category", "Minería"),
+            "content_blocks": fields.pop("content_blocks", [{"type": "paragraph", "text": "hola mundo"}]),
+            **fields,
+        }
+        response = client.post("/posts/", json=body, headers=headers or auth())
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["data"]
+    return create
@@ -0,0 +1,90 @@
+# tests/infinity_stub.py
+"""
+Servidor HTTP local que imita el login de Infinity para probar latencia y
+caídas sin salir de la máquina.
+
+Cada POST consume la siguiente acción de `script` (la última se repite):
+- "ok": 200 con un usuario válido
+- 401 / 502 / 503 / ...: responde ese status
+- ("slow", segundos, acción): espera y después aplica la acción
+- "drop": corta la conexión sin responder
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+USER = {"user_id": 99, "membership_level": "Gold", "is_admin": False, "is_buyer": True, "is_seller": False}
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # El cliente cortó por timeout mientras el stub "demoraba": es lo esperado
+        pass
+
+
+class InfinityStub:
+    def __init__(self, *script):
+        self.script = list(script) or ["ok"]
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server = _QuietServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/users/login"
+
+    def next_action(self):
+        with self._lock:
+            action = self.script[min(self.calls, len(self.script) - 1)]
+            self.calls += 1
+            return action
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._respond(stub.next_action())
+
+            def _respond(self, action):
+                if isinstance(action, tuple) and action[0] == "slow":
+                    time.sleep(action[1])
+                    return self._respond(action[2])
+                if action == "drop":
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    self.close_connection = True
+                    return
+                status = 200 if action == "ok" else action
+                body = json.dumps(USER if status == 200 else {"error": "stub"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def unused_port_url():
+    """URL a un puerto local donde no escucha nadie (conexión rechazada)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/users/login"
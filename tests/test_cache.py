@@ -0,0 +1,116 @@
+# tests/test_cache.py
+from fnmatch import fnmatchcase
+
+from flask import Flask
+
+from app.utils.cache import LRUCache, PostCache, RedisCache
+
+
+class FakeRedis:
+    """Sustituto local de redis-py: solo lo que usa RedisCache"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*", count=None):
+        return [k for k in list(self.data) if fnmatchcase(k, match)]
+
+
+class DownRedis(FakeRedis):
+    """Redis caído: cada operación falla como lo haría redis-py sin servidor"""
+
+    def get(self, key):
+        raise ConnectionError("Connection refused")
+
+    def set(self, key, value, ex=None):
+        raise TimeoutError("Timeout writing to socket")
+
+    def delete(self, *keys):
+        raise ConnectionError("Connection refused")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_expires_entries():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=0)
+    assert cache.get("a") is None
+
+
+def test_redis_cache_prefixes_keys_and_ttl():
+    client = FakeRedis()
+    cache = RedisCache(client, ttl=30, prefix="t:")
+    cache.set("k", "v")
+    assert client.data == {"t:k": "v"}
+    assert client.ttls["t:k"] == 30
+    assert cache.get("k") == "v"
+    cache.delete("k")
+    assert cache.get("k") is None
+
+
+def test_redis_cache_clear_only_touches_its_prefix():
+    client = FakeRedis()
+    client.set("other:k", "x")
+    cache = RedisCache(client, prefix="t:")
+    for i in range(1200):
+        cache.set(f"k{i}", i)
+    cache.clear(batch_size=500)
+    assert client.data == {"other:k": "x"}
+
+
+def test_post_cache_stores_and_invalidates_by_id_and_slug():
+    post_cache = PostCache(RedisCache(FakeRedis()))
+    post_cache.store(7, "hola", '{"id":7}')
+    assert post_cache.get("7") == '{"id":7}'
+    assert post_cache.get("hola") == '{"id":7}'
+    post_cache.invalidate(7, "hola")
+    assert post_cache.get("7") is None
+    assert post_cache.get("hola") is None
+
+
+def test_redis_errors_are_a_miss_and_a_no_op(caplog):
+    post_cache = PostCache(RedisCache(DownRedis()))
+    post_cache.store(7, "hola", '{"id":7}')
+    assert post_cache.get("7") is None
+    post_cache.invalidate(7, "hola")
+    events = [r.getMessage() for r in caplog.records if r.name == "app.utils.cache"]
+    assert events == ["cache.redis_error"] * 4
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config.update(POST_CACHE_BACKEND="memory", POST_CACHE_TTL=300, **config)
+    return app
+
+
+def test_memory_backend_keeps_ttl_with_a_single_worker():
+    post_cache = PostCache()
+    post_cache.init_app(_app(WEB_CONCURRENCY=1))
+    assert post_cache.backend.ttl == 300
+
+
+def test_memory_backend_shortens_ttl_with_several_workers():
+    post_cache = PostCache()
+    post_cache.init_app(_app(WEB_CONCURRENCY=4, POST_CACHE_LOCAL_TTL=5))
+    assert post_cache.backend.ttl == 5
@@ -0,0 +1,37 @@
+# tests/test_facets.py
+from app.utils import slugs
+
+
+def _counts(client):
+    facets = client.get("/posts/facets").get_json()
+    return {c["key"]: c["count"] for c in facets["categories"]}
+
+
+def test_facet_counts_follow_create_edit_and_delete(client, auth, new_post):
+    first = new_post("Cobre")
+    new_post("Litio")
+    assert _counts(client) == {"minería": 2}
+
+    assert client.put(f"/posts/{first['id']}", json={"category": "Energía"}, headers=auth()).status_code == 200
+    assert _counts(client) == {"minería": 1, "energía": 1}
+
+    assert client.delete(f"/posts/{first['id']}", headers=auth()).status_code == 200
+    assert _counts(client) == {"minería": 1}
+
+
+def test_slug_retry_does_not_count_the_post_twice(client, new_post, monkeypatch):
+    taken = new_post("Cobre")["slug"]
+
+    # El primer intento choca con el índice único (otro create ganó la carrera)
+    real = slugs.generate_unique_slug
+    attempts = []
+
+    def colliding(title, user_id):
+        attempts.append(title)
+        return taken if len(attempts) == 1 else real(title, user_id)
+
+    monkeypatch.setattr(slugs, "generate_unique_slug", colliding)
+    new_post("Litio")
+
+    assert len(attempts) == 2
+    assert _counts(client) == {"minería": 2}
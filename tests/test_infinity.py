@@ -0,0 +1,141 @@
+# tests/test_infinity.py
+import time
+
+import pytest
+import requests
+from flask import Flask
+
+from app.config import Config
+from app.utils.infinity import CircuitBreaker, InfinityClient, InfinityUnavailable
+from infinity_stub import InfinityStub, unused_port_url
+
+
+def make_client(url, **config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update({
+        "INFINITY_LOGIN_URL": url,
+        "INFINITY_CONNECT_TIMEOUT": 0.5,
+        "INFINITY_READ_TIMEOUT": 0.5,
+        "INFINITY_MAX_RETRIES": 2,
+        "INFINITY_LOGIN_DEADLINE": 3,
+        "INFINITY_BREAKER_THRESHOLD": 2,
+        "INFINITY_BREAKER_RESET": 0.3,
+        **config,
+    })
+    client = InfinityClient()
+    client.init_app(app)
+    return client
+
+
+def test_login_ok():
+    with InfinityStub("ok") as stub:
+        response = make_client(stub.url).login("a@b.c", "p")
+    assert response.status_code == 200
+    assert response.json()["user_id"] == 99
+
+
+def test_invalid_credentials_are_not_retried_nor_count_as_failure():
+    with InfinityStub(401) as stub:
+        client = make_client(stub.url)
+        assert client.login("a@b.c", "p").status_code == 401
+        assert client.login("a@b.c", "p").status_code == 401
+    assert stub.calls == 2
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retries_proxy_errors_then_succeeds():
+    with InfinityStub(503, 502, "ok") as stub:
+        response = make_client(stub.url).login("a@b.c", "p")
+    assert response.status_code == 200
+    assert stub.calls == 3
+
+
+def test_retries_are_capped_by_max_retries():
+    with InfinityStub(503) as stub:
+        client = make_client(stub.url)
+        assert client.login("a@b.c", "p").status_code == 503
+    assert stub.calls == 3
+    assert client.breaker.failures == 1
+
+
+def test_read_timeout_is_not_retried():
+    with InfinityStub(("slow", 1.0, "ok")) as stub:
+        client = make_client(stub.url)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.login("a@b.c", "p")
+    assert stub.calls == 1
+
+
+def test_dropped_connections_are_retried():
+    with InfinityStub("drop", "ok") as stub:
+        response = make_client(stub.url).login("a@b.c", "p")
+    assert response.status_code == 200
+    assert stub.calls == 2
+
+
+def test_connection_refused_raises_after_retries():
+    client = make_client(unused_port_url())
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.login("a@b.c", "p")
+    assert client.breaker.failures == 1
+
+
+def test_deadline_bounds_slow_proxy_errors():
+    # Cada intento tarda 0.4s y devuelve 503: sin plazo serían 3 intentos + backoff
+    with InfinityStub(("slow", 0.4, 503)) as stub:
+        client = make_client(stub.url, INFINITY_LOGIN_DEADLINE=1.0, INFINITY_MAX_RETRIES=5)
+        started = time.monotonic()
+        assert client.login("a@b.c", "p").status_code == 503
+        elapsed = time.monotonic() - started
+    assert elapsed < 1.2
+    assert stub.calls < 3
+
+
+def test_breaker_opens_fails_fast_and_recovers_after_probe():
+    with InfinityStub(503, 503, 503, 503, 503, 503, "ok") as stub:
+        client = make_client(stub.url, INFINITY_MAX_RETRIES=0)
+        client.login("a@b.c", "p")
+        client.login("a@b.c", "p")
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        calls = stub.calls
+        with pytest.raises(InfinityUnavailable):
+            client.login("a@b.c", "p")
+        assert stub.calls == calls
+
+        time.sleep(0.35)
+        stub.script = ["ok"]
+        stub.calls = 0
+        assert client.login("a@b.c", "p").status_code == 200
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_the_circuit():
+    with InfinityStub(503) as stub:
+        client = make_client(stub.url, INFINITY_MAX_RETRIES=0)
+        client.login("a@b.c", "p")
+        client.login("a@b.c", "p")
+        time.sleep(0.35)
+        client.login("a@b.c", "p")
+        assert client.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(InfinityUnavailable):
+            client.login("a@b.c", "p")
+
+
+class ExplodingSession:
+    def post(self, *args, **kwargs):
+        raise ValueError("respuesta inesperada")
+
+    def close(self):
+        pass
+
+
+def test_unexpected_error_in_half_open_probe_releases_it():
+    client = make_client("http://stub.invalid/login")
+    client.breaker.state = CircuitBreaker.HALF_OPEN
+    client._session = ExplodingSession()
+    with pytest.raises(ValueError):
+        client.login("a@b.c", "p")
+    # Otro request puede volver a probar en vez de quedar rechazado para siempre
+    assert client.breaker.allow()
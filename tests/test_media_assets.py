@@ -0,0 +1,93 @@
+# tests/test_media_assets.py
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.assetDeletion import AssetDeletion
+from app.models.mediaAsset import MediaAsset
+from app.utils.media_assets import record_asset, revive_asset, sweep_unused_assets
+from app.utils.outbox import drain_asset_outbox
+
+
+class FakeCloudinary:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_resources(self, public_ids):
+        self.deleted.extend(public_ids)
+        return {"deleted": {public_id: "deleted" for public_id in public_ids}}
+
+
+def _asset(public_id, created_at=None):
+    asset = record_asset(f"sha-{public_id}", f"https://img/{public_id}.jpg", public_id)
+    if created_at is not None:
+        asset.created_at = created_at
+    db.session.commit()
+    return asset
+
+
+def _featured(public_id):
+    return {"featured_image": f"https://img/{public_id}.jpg", "featured_image_public_id": public_id}
+
+
+def _pending():
+    return [row.public_id for row in AssetDeletion.query.order_by(AssetDeletion.id)]
+
+
+def test_reusing_an_image_cancels_its_pending_destroy(client, auth, new_post):
+    _asset("img1")
+    first = new_post("Cobre", **_featured("img1"))
+    assert client.delete(f"/posts/{first['id']}", headers=auth()).status_code == 200
+    assert _pending() == ["img1"]
+    assert MediaAsset.query.filter_by(public_id="img1").one().ref_count == 0
+
+    # Un upload deduplicado devolvió img1 antes del borrado: el post nuevo la retoma
+    new_post("Litio", **_featured("img1"))
+    assert _pending() == []
+    assert MediaAsset.query.filter_by(public_id="img1").one().ref_count == 1
+
+
+def test_the_worker_drops_the_asset_row_only_after_destroying_it(client, auth, new_post):
+    _asset("img1")
+    first = new_post("Cobre", **_featured("img1"))
+    client.delete(f"/posts/{first['id']}", headers=auth())
+    assert MediaAsset.query.filter_by(public_id="img1").count() == 1
+
+    cloudinary = FakeCloudinary()
+    assert drain_asset_outbox(cloudinary) == (1, 0)
+    assert cloudinary.deleted == ["img1"]
+    # Sin fila, el dedupe ya no la devuelve: el mismo contenido se vuelve a subir
+    assert MediaAsset.query.filter_by(public_id="img1").count() == 0
+
+
+def test_destroyed_while_saving_returns_409(client, auth, monkeypatch):
+    _asset("img1")
+    from app.utils import media_assets
+
+    # El worker destruyó la imagen entre la consulta y el UPDATE del conteo
+    monkeypatch.setattr(media_assets, "acquire_asset", lambda public_id, count=1: False)
+    body = {"title": "Cobre", "description": "d", "category": "c",
+            "content_blocks": [{"type": "paragraph", "text": "x"}], **_featured("img1")}
+    response = client.post("/posts/", json=body, headers=auth())
+    assert response.status_code == 409
+    assert response.get_json()["public_id"] == "img1"
+
+
+def test_revive_fails_once_the_worker_destroyed_the_image(app):
+    asset = _asset("img1")
+    db.session.delete(asset)
+    db.session.commit()
+    assert revive_asset(asset) is False
+
+
+def test_sweep_queues_only_old_unused_images(new_post):
+    old = datetime.utcnow() - timedelta(days=2)
+    _asset("viejo", created_at=old)
+    _asset("nuevo")
+    _asset("usado", created_at=old)
+    new_post("Cobre", **_featured("usado"))
+
+    assert sweep_unused_assets(timedelta(hours=24)) == 1
+    db.session.commit()
+    assert _pending() == ["viejo"]
+    # Ya agendada: una segunda pasada no la duplica
+    assert sweep_unused_assets(timedelta(hours=24)) == 0
@@ -0,0 +1,83 @@
+# tests/test_membership_rules.py
+from datetime import datetime
+
+from app.extensions import db
+from app.models import WeeklyPostQuota
+from app.utils.membership_rules import (
+    count_user_posts_this_week, get_current_iso_week, release_weekly_post, reserve_weekly_posts,
+)
+
+BRONZE = {"id": 1, "membership_level": "bronze"}    # 1 post por semana
+GOLD = {"id": 2, "membership_level": "gold"}        # 5 posts por semana
+PLATINUM = {"id": 3, "membership_level": "platinum"}
+
+MONDAY = datetime(2026, 10, 12, 9, 0)
+SUNDAY = datetime(2026, 10, 18, 23, 59)
+NEXT_MONDAY = datetime(2026, 10, 19, 0, 1)
+
+
+def _count(user, now):
+    iso_year, iso_week = get_current_iso_week(now)
+    quota = db.session.get(WeeklyPostQuota, (user["id"], iso_year, iso_week))
+    return quota.post_count if quota else 0
+
+
+def test_reserve_stops_at_the_weekly_limit(app):
+    assert [reserve_weekly_posts(GOLD, now=MONDAY) for _ in range(6)] == [True] * 5 + [False]
+    assert _count(GOLD, MONDAY) == 5
+
+
+def test_batch_reservation_is_all_or_nothing(app):
+    assert reserve_weekly_posts(GOLD, count=3, now=MONDAY)
+    assert not reserve_weekly_posts(GOLD, count=3, now=MONDAY)
+    assert _count(GOLD, MONDAY) == 3
+    assert not reserve_weekly_posts(BRONZE, count=2, now=MONDAY)
+    assert _count(BRONZE, MONDAY) == 0
+
+
+def test_platinum_has_no_limit(app):
+    assert all(reserve_weekly_posts(PLATINUM, now=MONDAY) for _ in range(20))
+    assert _count(PLATINUM, MONDAY) == 20
+
+
+def test_release_gives_back_the_slot_of_the_post_week(app):
+    assert reserve_weekly_posts(BRONZE, now=MONDAY)
+    assert not reserve_weekly_posts(BRONZE, now=SUNDAY)
+    release_weekly_post(BRONZE["id"], MONDAY)
+    assert reserve_weekly_posts(BRONZE, now=SUNDAY)
+
+
+def test_release_never_goes_below_zero(app):
+    release_weekly_post(BRONZE["id"], MONDAY)
+    assert reserve_weekly_posts(BRONZE, now=MONDAY)
+    release_weekly_post(BRONZE["id"], MONDAY)
+    release_weekly_post(BRONZE["id"], MONDAY)
+    assert _count(BRONZE, MONDAY) == 0
+
+
+def test_week_boundary_starts_a_new_counter(app):
+    assert reserve_weekly_posts(BRONZE, now=SUNDAY)
+    assert not reserve_weekly_posts(BRONZE, now=SUNDAY)
+    assert reserve_weekly_posts(BRONZE, now=NEXT_MONDAY)
+    # Liberar un post de la semana anterior no toca la nueva
+    release_weekly_post(BRONZE["id"], SUNDAY)
+    assert _count(BRONZE, NEXT_MONDAY) == 1
+
+
+def test_iso_year_is_part_of_the_week(app):
+    # Misma semana 42, otro año: el contador no se repite de un año al otro
+    assert reserve_weekly_posts(BRONZE, now=MONDAY)
+    assert reserve_weekly_posts(BRONZE, now=datetime(2027, 10, 18))
+
+
+def test_create_and_delete_through_the_api(client, auth, new_post):
+    headers = auth(user_id=1, level="bronze")
+    post = new_post("Cobre", headers=headers)
+    assert count_user_posts_this_week(1) == 1
+    body = {"title": "Litio", "description": "d", "category": "c",
+            "content_blocks": [{"type": "paragraph", "text": "x"}]}
+    assert client.post("/posts/", json=body, headers=headers).status_code == 403
+
+    assert client.delete(f"/posts/{post['id']}", headers=headers).status_code == 200
+    assert count_user_posts_this_week(1) == 0
+    assert client.post("/posts/", json=body, headers=headers).status_code == 201
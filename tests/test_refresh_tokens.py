@@ -0,0 +1,132 @@
+# tests/test_refresh_tokens.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.refresh_tokens import (
+    RefreshTokenError, hash_refresh_token, issue_refresh_token, prune_refresh_tokens,
+    rotate_refresh_token,
+)
+from app.extensions import db
+from app.models import BlogUser, RefreshToken
+
+
+@pytest.fixture
+def user(app):
+    user = BlogUser(infinity_id=99, email="ana@example.com", username="ana")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def login(user):
+    """Emite un refresh token como lo hace /auth/login; devuelve el token en claro"""
+    def issue(**kwargs):
+        raw, _ = issue_refresh_token(user, "gold", **kwargs)
+        db.session.commit()
+        return raw
+    return issue
+
+
+def _record(raw):
+    return RefreshToken.query.filter_by(token_hash=hash_refresh_token(raw)).one()
+
+
+def _refresh(client, raw):
+    return client.post("/auth/refresh", json={"refresh_token": raw})
+
+
+def test_only_the_hash_is_stored(login):
+    raw = login()
+    assert RefreshToken.query.filter_by(token_hash=raw).count() == 0
+    assert _record(raw).membership_level == "gold"
+
+
+def test_rotate_revokes_the_used_token_and_keeps_the_family(login):
+    raw = login()
+    new_raw, new_record = rotate_refresh_token(raw)
+    db.session.commit()
+
+    old = _record(raw)
+    assert new_raw != raw
+    assert old.revoked_at is not None
+    assert old.replaced_by_id == new_record.id
+    assert new_record.family_id == old.family_id
+    assert new_record.membership_level == "gold"
+    assert new_record.membership_validated_at == old.membership_validated_at
+
+
+def test_refresh_endpoint_returns_a_new_pair(client, login):
+    response = _refresh(client, login())
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["access_token"] and data["refresh_token"]
+    assert data["user"]["username"] == "ana"
+
+
+def test_reusing_a_rotated_token_revokes_the_whole_family(client, login):
+    stolen = login()
+    current = _refresh(client, stolen).get_json()["refresh_token"]
+
+    response = _refresh(client, stolen)
+    assert response.status_code == 401
+    assert response.get_json()["reauth"] is True
+
+    family = _record(stolen).family_id
+    assert RefreshToken.query.filter_by(family_id=family, revoked_at=None).count() == 0
+    # El token legítimo más nuevo tampoco sirve ya
+    assert _refresh(client, current).status_code == 401
+
+
+def test_reuse_does_not_touch_other_sessions(client, login):
+    stolen, other = login(), login()
+    _refresh(client, stolen)
+    _refresh(client, stolen)
+    assert _refresh(client, other).status_code == 200
+
+
+def test_logout_revokes_the_family(client, login):
+    raw = login()
+    current = _refresh(client, raw).get_json()["refresh_token"]
+
+    assert client.post("/auth/logout", json={"refresh_token": current}).status_code == 200
+    assert RefreshToken.query.filter_by(family_id=_record(raw).family_id, revoked_at=None).count() == 0
+    response = _refresh(client, current)
+    assert response.status_code == 401
+    assert response.get_json()["reauth"] is True
+
+
+def test_logout_with_an_unknown_token_is_harmless(client, login):
+    raw = login()
+    assert client.post("/auth/logout", json={"refresh_token": "nope"}).status_code == 200
+    assert _refresh(client, raw).status_code == 200
+
+
+def test_unknown_expired_and_stale_membership_are_rejected(app, login):
+    with pytest.raises(RefreshTokenError) as unknown:
+        rotate_refresh_token("nope")
+    assert unknown.value.reauth is False
+
+    expired = login()
+    _record(expired).expires_at = datetime.utcnow() - timedelta(seconds=1)
+    with pytest.raises(RefreshTokenError) as err:
+        rotate_refresh_token(expired)
+    assert err.value.reauth is True
+
+    hours = app.config["MEMBERSHIP_REVALIDATE_HOURS"]
+    stale = login(validated_at=datetime.utcnow() - timedelta(hours=hours + 1))
+    with pytest.raises(RefreshTokenError) as err:
+        rotate_refresh_token(stale)
+    assert err.value.reauth is True
+
+
+def test_prune_keeps_revoked_tokens_until_they_expire(login):
+    revoked = login()
+    rotate_refresh_token(revoked)
+    expired = login()
+    _record(expired).expires_at = datetime.utcnow() - timedelta(days=1)
+    db.session.commit()
+
+    assert prune_refresh_tokens() == 1
+    assert RefreshToken.query.filter_by(token_hash=hash_refresh_token(revoked)).count() == 1
@@ -0,0 +1,94 @@
+# tests/test_slugs.py
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.post import Post
+from app.utils import slugs
+from app.utils.slugs import (
+    RESERVED_SLUGS, allocate_unique_slugs, generate_unique_slug, is_reserved_slug,
+    save_with_unique_slug,
+)
+
+
+def _post(slug, title="t", user_id=1):
+    post = Post(title=title, description="d", category="c", user_id=user_id, user_name="u",
+                week_number=1, slug=slug)
+    post.set_content([{"type": "paragraph", "text": "x"}])
+    db.session.add(post)
+    db.session.commit()
+    return post
+
+
+def test_free_base_slug_is_used_as_is(app):
+    assert generate_unique_slug("Economía Circular", 1) == "economia-circular"
+
+
+def test_taken_slugs_get_numbered_suffixes(app):
+    _post("cobre")
+    assert generate_unique_slug("Cobre", 7) == "cobre-1-7"
+    assert generate_unique_slug("Cobre", 7) == "cobre-2-7"
+    assert generate_unique_slug("Cobre", 8) == "cobre-3-8"
+
+
+def test_suffix_skips_slugs_taken_before_the_reservations(app):
+    _post("cobre")
+    _post("cobre-1-7")
+    assert generate_unique_slug("Cobre", 7) == "cobre-2-7"
+
+
+@pytest.mark.parametrize("title", sorted(RESERVED_SLUGS) + ["2024"])
+def test_reserved_and_numeric_slugs_always_get_a_suffix(app, title):
+    slug = generate_unique_slug(title, 1)
+    assert slug != title and slug.startswith(f"{title}-")
+    assert not is_reserved_slug(slug)
+
+
+def test_batch_resolves_duplicates_inside_the_batch(app):
+    _post("cobre")
+    items = [("Cobre", 1), ("Litio", 1), ("Litio", 2), ("Cobre", 2), ("Zinc", 1)]
+    result = allocate_unique_slugs(items)
+    assert result == ["cobre-1-1", "litio", "litio-1-2", "cobre-2-2", "zinc"]
+    assert len(set(result)) == len(result)
+
+
+def test_batch_keeps_free_preferred_slugs(app):
+    _post("cobre-chileno")
+    items = [("Cobre", 1), ("Litio", 1), ("Zinc", 1)]
+    preferred = ["cobre-chileno", "litio-del-norte", "search"]
+    assert allocate_unique_slugs(items, preferred) == ["cobre", "litio-del-norte", "zinc"]
+
+
+def test_batch_never_assigns_reserved_slugs(app):
+    result = allocate_unique_slugs([("Search", 1), ("Facets", 1), ("Bulk", 1)])
+    assert not any(is_reserved_slug(s) for s in result)
+
+
+def test_save_retries_after_a_unique_conflict(app, monkeypatch):
+    _post("cobre")
+    real = slugs.generate_unique_slug
+    calls = []
+
+    def colliding(title, user_id):
+        # El primer slug ya lo tomó otro create (carrera)
+        calls.append(title)
+        return "cobre" if len(calls) == 1 else real(title, user_id)
+
+    monkeypatch.setattr(slugs, "generate_unique_slug", colliding)
+    post = Post(title="Cobre", description="d", category="c", user_id=1, user_name="u", week_number=1)
+    post.set_content([{"type": "paragraph", "text": "x"}])
+
+    assert save_with_unique_slug(post, "Cobre", 1) == "cobre-1-1"
+    db.session.commit()
+    assert len(calls) == 2
+    assert sorted(p.slug for p in Post.query) == ["cobre", "cobre-1-1"]
+
+
+def test_save_gives_up_after_the_attempts(app, monkeypatch):
+    _post("cobre")
+    monkeypatch.setattr(slugs, "generate_unique_slug", lambda title, user_id: "cobre")
+    post = Post(title="Cobre", description="d", category="c", user_id=1, user_name="u", week_number=1)
+    post.set_content([{"type": "paragraph", "text": "x"}])
+
+    with pytest.raises(IntegrityError):
+        save_with_unique_slug(post, "Cobre", 1, attempts=2)
@@ -0,0 +1,29 @@
+# tests/test_transfer.py
+import json
+
+from app.models.post import Post
+from app.utils.transfer import import_lines
+
+
+def _line(title, **fields):
+    return json.dumps({
+        "title": title, "description": "d", "category": "Minería",
+        "user_id": 1, "user_name": "user1",
+        "content_blocks": [{"type": "paragraph", "text": "hola"}],
+        **fields,
+    })
+
+
+def test_import_keeps_free_well_formed_slugs(app):
+    result = import_lines([_line("Cobre", slug="cobre-chileno")])
+    assert result == {"imported": 1, "errors": []}
+    assert Post.query.one().slug == "cobre-chileno"
+
+
+def test_import_replaces_malformed_slugs_with_the_title_slug(app, client):
+    lines = [_line("Cobre", slug="a/b"), _line("Litio", slug="../x"), _line("Zinc", slug="Zinc Puro")]
+    assert import_lines(lines)["imported"] == 3
+
+    slugs = sorted(p.slug for p in Post.query)
+    assert slugs == ["cobre", "litio", "zinc"]
+    assert client.get("/posts/cobre").status_code == 200